@@ -1,16 +1,125 @@
-from textblob import TextBlob
+import numpy as np
+import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
-from wordcloud import WordCloud
+from wordcloud_cache import get_wordcloud_cache
+from word_index import WordFrequencyIndex
+from diagnostics import DISABLED_TRACER
+from sentiment_backends import SENTIMENT_LABELS, BACKEND_TEXTBLOB, get_backend, backend_choices, score_unique_texts
 
-def analyze_sentiment(text):
-    analysis = TextBlob(str(text))
-    polarity = analysis.sentiment.polarity
+# Polarity is in [-1, 1], so float32 holds it at half the size of float64.
+SCORE_DTYPE = np.float32
+
+def analyze_sentiment(text, cache=None, backend=BACKEND_TEXTBLOB):
+    if backend != BACKEND_TEXTBLOB:
+        polarity = float(score_unique_texts(backend, [str(text)], cache=cache)[0])
+        return SENTIMENT_LABELS[get_backend(backend).codes([polarity])[0]], polarity
+    # Imported on first use; TextBlob pulls in NLTK, which dominates startup time.
+    from textblob import TextBlob
+    if cache is not None:
+        polarity = cache.score([str(text)], lambda texts: [TextBlob(t).sentiment.polarity for t in texts])[0]
+    else:
+        polarity = TextBlob(str(text)).sentiment.polarity
     return 'Positive' if polarity > 0.1 else 'Negative' if polarity < -0.1 else 'Neutral', polarity
 
-def generate_wordcloud(text_series):
-    text = ' '.join(text_series.dropna().astype(str))
-    wordcloud = WordCloud(width=800, height=400, background_color='white').generate(text)
+def deduplicate_texts(series):
+    """Normalize whitespace and factorize so each distinct text is scored once; uniques[codes] rebuilds the column."""
+    texts = pd.Series(series).astype(str).str.replace(r'\s+', ' ', regex=True).str.strip()
+    codes, uniques = pd.factorize(texts)
+    return codes, uniques.tolist()
+
+def index_words(series, codes, uniques, unique_codes):
+    """Token counts per sentiment code, tokenizing each distinct text once and weighting it by its non-missing rows."""
+    occurrences = np.bincount(codes[pd.Series(series).notna().to_numpy()], minlength=len(uniques))
+    word_index = WordFrequencyIndex()
+    word_index.update(uniques, unique_codes, occurrences)
+    return word_index
+
+def score_polarity(series, backend=BACKEND_TEXTBLOB):
+    codes, uniques = deduplicate_texts(series)
+    return score_unique_texts(backend, uniques)[codes]
+
+def analyze_sentiment_batch(series, backend=BACKEND_TEXTBLOB):
+    polarity = score_polarity(series, backend)
+    return np.array(SENTIMENT_LABELS, dtype=object)[get_backend(backend).codes(polarity)], polarity
+
+class AnalysisResult:
+    """Label codes (int8), polarity (float32) and the reductions the charts need, computed in one pass.
+
+    ``backend`` names the scorer that produced the polarity, so caches keyed on it tell results apart.
+    """
+
+    def __init__(self, codes, polarity, unique_count=None, bins=20, word_index=None, backend=None):
+        self.backend = backend
+        self.unique_count = unique_count
+        self.word_index = word_index
+        self.codes = np.asarray(codes, dtype=np.int8)
+        self.counts = pd.Series(np.bincount(self.codes, minlength=len(SENTIMENT_LABELS)), index=SENTIMENT_LABELS)
+        self.total = int(self.counts.sum())
+        polarity = np.asarray(polarity, dtype=float)
+        self.mean = float(polarity.mean()) if self.total else float('nan')
+        self.histogram = np.histogram(polarity, bins=bins, range=(-1, 1))
+        self.polarity = polarity.astype(SCORE_DTYPE)
+
+    @property
+    def labels(self):
+        return np.array(SENTIMENT_LABELS, dtype=object)[self.codes]
+
+    def columns(self):
+        """The per-row results as ``{column name: values}``, labels as a Categorical over the codes."""
+        return {'sentiment': pd.Categorical.from_codes(self.codes, SENTIMENT_LABELS), 'polarity': self.polarity}
+
+    def value_counts(self):
+        counts = self.counts[self.counts > 0]
+        return counts.sort_values(ascending=False, kind='stable')
+
+    @property
+    def dedup_ratio(self):
+        if not self.unique_count or not self.total:
+            return 0.0
+        return 1 - self.unique_count / self.total
+
+    def share(self, label):
+        return self.counts[label] / self.total if self.total else 0.0
+
+def analyze_text_column(series, backend=BACKEND_TEXTBLOB, tracer=DISABLED_TRACER):
+    with tracer.span('deduplicate_texts', rows=len(series)):
+        codes, uniques = deduplicate_texts(series)
+    with tracer.span('score_unique_texts', texts=len(uniques), backend=backend):
+        unique_polarity = score_unique_texts(backend, uniques)
+        unique_codes = get_backend(backend).codes(unique_polarity)
+    with tracer.span('index_words', texts=len(uniques)):
+        word_index = index_words(series, codes, uniques, unique_codes)
+    tracer.count('rows_scored', len(series))
+    tracer.count('unique_texts', len(uniques))
+    polarity = unique_polarity[codes]
+    return AnalysisResult(unique_codes[codes], polarity, unique_count=len(uniques), word_index=word_index,
+                          backend=backend)
+
+def histogram_density(histogram, grid_size=200):
+    """A Gaussian KDE curve over a histogram's values, in bar-height units like ``histplot(kde=True)``.
+
+    Each bin center is weighted by its count and the bandwidth follows Scott's rule, so the curve
+    needs only ``AnalysisResult.histogram``, not the per-row polarity. Returns ``(x, y)``.
+    """
+    counts, edges = histogram
+    total = counts.sum()
+    if not total:
+        return np.array([]), np.array([])
+    centers = (edges[:-1] + edges[1:]) / 2
+    widths = np.diff(edges)
+    mean = np.average(centers, weights=counts)
+    std = np.sqrt(np.average((centers - mean) ** 2, weights=counts))
+    bandwidth = std * total ** (-1 / 5) if std > 0 else widths.mean()
+    filled = np.flatnonzero(counts)
+    # Like histplot's KDE, the curve stops at the data rather than extending past it.
+    x = np.linspace(edges[filled[0]], edges[filled[-1] + 1], grid_size)
+    kernels = np.exp(-0.5 * ((x[:, None] - centers[None, :]) / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+    return x, kernels @ counts * widths.mean()
+
+def generate_wordcloud(frequencies):
+    if not frequencies:
+        frequencies = {"No data available.": 1}
+    wordcloud = get_wordcloud_cache().render(frequencies, 800, 400, 'white')
     fig, ax = plt.subplots(figsize=(10, 5))
     ax.imshow(wordcloud, interpolation='bilinear')
     ax.axis('off')
@@ -26,8 +135,9 @@ def analyze_numeric_ratings(df, column_name):
     }
     return results
 
-def get_sample_data(df, column_name, analysis_type, n_samples=5):
-    if analysis_type == 'numeric':
-        return df[[column_name, 'rating']].sample(min(n_samples, len(df)))
-    else:
-        return df[[column_name, 'sentiment', 'polarity']].sample(min(n_samples, len(df)))
\ No newline at end of file
+def get_sample_data(df, column_name, columns, n_samples=5):
+    """Random rows of ``column_name`` beside their derived ``columns`` ({name: per-row values}),
+    built for the sampled rows only."""
+    positions = np.random.choice(len(df), min(n_samples, len(df)), replace=False)
+    sample = df[column_name].iloc[positions].to_frame()
+    return sample.assign(**{name: values[positions] for name, values in columns.items()})
\ No newline at end of file
@@ -0,0 +1,66 @@
+import hashlib
+import io
+import pandas as pd
+import streamlit as st
+import matplotlib.pyplot as plt
+from analysis_function import analyze_text_column, generate_wordcloud, histogram_density, BACKEND_TEXTBLOB
+from utils import load_employee_reviews, is_numeric_column, to_numeric
+from config import CACHE_TTL_SECONDS, CACHE_MAX_ENTRIES
+from diagnostics import DISABLED_TRACER
+
+# Cached functions take a ``dataset_key`` (uploaded file hash or dataset name) plus the column
+# name as their cache key. Arguments starting with an underscore are not hashed by Streamlit,
+# so large Series and results are passed that way. Charts of a text result also take the
+# ``backend`` that scored it, since the same column gives different results per backend.
+
+def file_fingerprint(file_bytes):
+    return hashlib.sha256(file_bytes).hexdigest()
+
+# Datasets are cached as shared resources so reruns do not copy the frame; treat them as read-only.
+@st.cache_resource(ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def load_uploaded_csv(file_hash, _file_bytes):
+    return pd.read_csv(io.BytesIO(_file_bytes))
+
+@st.cache_resource(ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def load_employee_reviews_cached():
+    return load_employee_reviews()
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def is_numeric_column_cached(dataset_key, column, _series):
+    return is_numeric_column(_series)
+
+# A shared resource like the datasets: st.cache_data would pickle the whole result, word index
+# included, on every hit. Callers get the cached object itself and must treat it as read-only.
+@st.cache_resource(ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def analyze_column_cached(dataset_key, column, analysis_type, _series, backend=BACKEND_TEXTBLOB,
+                          _tracer=DISABLED_TRACER):
+    # Only runs on a cache miss, so the counter and spans show what was actually recomputed.
+    _tracer.count('analysis_cache_misses')
+    if analysis_type == 'numeric':
+        # Kept as float64: the metrics show these values directly, and float32 prints 3.7 as 3.700000047683716.
+        return to_numeric(_series).rename('rating')
+    return analyze_text_column(_series, backend, _tracer)
+
+@st.cache_resource(ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def render_text_charts(dataset_key, column, backend, _result):
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 4))
+    _result.value_counts().plot(kind='pie', autopct='%1.1f%%', colors=['green', 'red', 'blue'], ax=ax1)
+    ax1.set_ylabel('')
+    hist_counts, bin_edges = _result.histogram
+    bars = ax2.stairs(hist_counts, bin_edges, fill=True, alpha=0.6)
+    ax2.plot(*histogram_density(_result.histogram), color=bars.get_facecolor(), alpha=1)
+    ax2.set_xlabel("Sentiment Polarity (-1 to 1)")
+    return fig
+
+@st.cache_resource(ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def render_rating_histogram(dataset_key, column, _ratings):
+    # seaborn is only needed for this chart, so it is not imported at startup.
+    import seaborn as sns
+    fig, ax = plt.subplots(figsize=(10, 4))
+    sns.histplot(_ratings, bins=20, kde=True, ax=ax)
+    ax.set_xlabel("Rating Value")
+    return fig
+
+@st.cache_resource(ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def render_wordcloud(dataset_key, column, backend, _result):
+    return generate_wordcloud(_result.word_index.combined())
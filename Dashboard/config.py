@@ -12,4 +12,8 @@ CSS_STYLES = """
     </style>
 """
 
-DATASET_NAME = "kmrmanish/Employees_Reviews_Dataset"
\ No newline at end of file
+DATASET_NAME = "kmrmanish/Employees_Reviews_Dataset"
+
+# Streamlit cache eviction policy for datasets, analysis results and rendered charts.
+CACHE_TTL_SECONDS = 3600
+CACHE_MAX_ENTRIES = 16
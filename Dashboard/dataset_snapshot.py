@@ -0,0 +1,45 @@
+import os
+import sys
+import pyarrow.feather as feather
+
+DEFAULT_SNAPSHOT_DIR = os.environ.get(
+    "WLB_SNAPSHOT_DIR", os.path.join(os.path.expanduser("~"), ".wlb_cache", "snapshots"))
+
+
+def snapshot_path(dataset_name, split="train", directory=DEFAULT_SNAPSHOT_DIR):
+    return os.path.join(directory, f"{dataset_name.replace('/', '__')}-{split}.arrow")
+
+
+def write_snapshot(dataset_name, split="train", directory=DEFAULT_SNAPSHOT_DIR):
+    """Download a Hugging Face dataset split once and store it as an uncompressed Arrow file."""
+    # Imported here so reading an existing snapshot never needs the datasets package or a network.
+    from datasets import load_dataset
+    table = load_dataset(dataset_name, split=split).data.table
+    path = snapshot_path(dataset_name, split, directory)
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    # Uncompressed so the file can be memory-mapped and read without copying.
+    feather.write_feather(table, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_snapshot(dataset_name, columns=None, split="train", directory=DEFAULT_SNAPSHOT_DIR,
+                  as_arrow=False, refresh=False):
+    """Read ``columns`` of a dataset split from its local snapshot, creating the snapshot if needed.
+
+    The Arrow file is memory-mapped, so only the requested columns are ever materialized.
+    Returns a pandas DataFrame, or the pyarrow Table with ``as_arrow=True``.
+    """
+    path = snapshot_path(dataset_name, split, directory)
+    if refresh or not os.path.exists(path):
+        write_snapshot(dataset_name, split, directory)
+    table = feather.read_table(path, columns=columns, memory_map=True)
+    return table if as_arrow else table.to_pandas()
+
+
+if __name__ == "__main__":
+    # Prefetch on a connected machine, then copy the snapshot directory to offline hosts:
+    #   python dataset_snapshot.py kmrmanish/Employees_Reviews_Dataset
+    for name in sys.argv[1:] or ["kmrmanish/Employees_Reviews_Dataset"]:
+        print(write_snapshot(name))
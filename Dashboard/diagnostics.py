@@ -0,0 +1,142 @@
+"""Timing spans and counters for one analysis session, exportable as a Chrome trace.
+
+    tracer = Tracer()
+    with tracer.span('read_csv', path=path):
+        data = pd.read_csv(path)
+    tracer.count('rows_loaded', len(data))
+    tracer.export('trace.json')     # open in chrome://tracing or https://ui.perfetto.dev
+
+A disabled tracer returns one shared no-op context manager from ``span`` and ignores
+``count``, so the calls can stay in the code permanently. Spans may be opened from any thread;
+each is recorded against the thread it ran on.
+"""
+import contextlib
+import json
+import os
+import threading
+import time
+
+# Set to 1 to record timings from startup, e.g. for the headless CLI or a slow first run.
+TRACE_ENV = "WLB_TRACE"
+NULL_SPAN = contextlib.nullcontext()
+
+
+def tracing_requested():
+    return os.environ.get(TRACE_ENV, "") not in ("", "0")
+
+
+class Span:
+    """Context manager that records one timed span with its tracer when it exits."""
+    __slots__ = ("tracer", "name", "args", "start")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.record(self.name, self.start, time.perf_counter_ns(), self.args)
+        return False
+
+
+class Tracer:
+    """Collects spans as ``(name, start_ns, end_ns, thread id, args)`` and running counter totals."""
+
+    def __init__(self, enabled=None):
+        self.enabled = tracing_requested() if enabled is None else enabled
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.origin = time.perf_counter_ns()
+            self.spans = []
+            self.counters = {}
+            # (name, time_ns, total) per update, so the trace can plot each counter over time.
+            self.counter_events = []
+            self.thread_names = {}
+
+    def span(self, name, **args):
+        """Time a ``with`` block under ``name``; ``args`` are shown with the span in the trace."""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, args)
+
+    def record(self, name, start_ns, end_ns, args=None):
+        thread = threading.current_thread()
+        with self.lock:
+            self.thread_names[thread.ident] = thread.name
+            self.spans.append((name, start_ns, end_ns, thread.ident, args or {}))
+
+    def count(self, name, value=1):
+        """Add ``value`` to the integer counter ``name`` (rows processed, cache hits, ...)."""
+        if not self.enabled:
+            return
+        with self.lock:
+            total = self.counters[name] = self.counters.get(name, 0) + int(value)
+            self.counter_events.append((name, time.perf_counter_ns(), total))
+
+    def summary(self):
+        """``[(name, calls, total_seconds, max_seconds)]`` per span name, in order of first use."""
+        rows = {}
+        with self.lock:
+            # Spans are recorded as they end, so an enclosing span comes after its children.
+            spans = sorted(self.spans, key=lambda span: span[1])
+        for name, start, end, _, _ in spans:
+            calls, total, longest = rows.get(name, (0, 0, 0))
+            rows[name] = (calls + 1, total + end - start, max(longest, end - start))
+        return [(name, calls, total / 1e9, longest / 1e9) for name, (calls, total, longest) in rows.items()]
+
+    def report(self):
+        """The summary and counters as a plain-text table."""
+        if not self.enabled:
+            return f"Timing is switched off; turn it on (or set {TRACE_ENV}=1) and run the analysis again."
+        lines = [f"{'span':<44} {'calls':>6} {'total':>11} {'max':>11}"]
+        for name, calls, total, longest in self.summary():
+            lines.append(f"{name:<44} {calls:>6} {total * 1e3:>9.1f}ms {longest * 1e3:>9.1f}ms")
+        if len(lines) == 1:
+            lines.append("(no spans recorded yet)")
+        if self.counters:
+            lines.append("")
+            lines.append(f"{'counter':<44} {'total':>12}")
+            for name, total in self.counters.items():
+                lines.append(f"{name:<44} {total:>12,}")
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        """The spans and counters in Chrome's Trace Event Format, as a JSON-ready dict."""
+        pid = os.getpid()
+        with self.lock:
+            spans = list(self.spans)
+            counter_events = list(self.counter_events)
+            thread_names = dict(self.thread_names)
+        events = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                  for tid, name in thread_names.items()]
+        for name, start, end, tid, args in spans:
+            events.append({"name": name, "cat": "wlb", "ph": "X", "pid": pid, "tid": tid,
+                           "ts": (start - self.origin) / 1e3, "dur": (end - start) / 1e3,
+                           "args": {key: value if isinstance(value, (int, float, bool)) else str(value)
+                                    for key, value in args.items()}})
+        for name, at, total in counter_events:
+            events.append({"name": name, "ph": "C", "pid": pid, "ts": (at - self.origin) / 1e3,
+                           "args": {name: total}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export(self, path):
+        """Write ``chrome_trace()`` to ``path`` and return the path."""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as handle:
+            json.dump(self.chrome_trace(), handle)
+        os.replace(tmp_path, path)
+        return path
+
+
+# Default for functions that take an optional tracer, so they never need to check for None.
+DISABLED_TRACER = Tracer(enabled=False)
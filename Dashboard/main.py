@@ -1,8 +1,25 @@
+import json
 import streamlit as st
 import pandas as pd
 from analysis_function import *
 from utils import *
 from config import *
+from caching import *
+from diagnostics import Tracer
+from result_store import ResultStore
+
+def get_tracer():
+    """This session's timing spans, kept across reruns; off unless WLB_TRACE is set or the box is ticked."""
+    if 'tracer' not in st.session_state:
+        st.session_state['tracer'] = Tracer()
+    return st.session_state['tracer']
+
+def get_result_store(df):
+    """Analysis results for ``df``, kept beside the shared frame rather than in a copy of it."""
+    store = st.session_state.get('results')
+    if store is None or store.data is not df:
+        store = st.session_state['results'] = ResultStore(df)
+    return store
 
 def init_app():
     st.set_page_config(**PAGE_CONFIG)
@@ -11,6 +28,7 @@ def init_app():
     st.markdown("Analyze both text sentiment and numeric ratings about work-life balance")
 
 def sidebar_controls():
+    tracer = get_tracer()
     with st.sidebar:
         st.header("Input Options")
         input_method = st.radio("Choose input method:", 
@@ -19,24 +37,35 @@ def sidebar_controls():
         if input_method == "CSV Upload":
             uploaded_file = st.file_uploader("Upload CSV file", type=['csv'])
             if uploaded_file is not None:
-                df = pd.read_csv(uploaded_file)
+                file_bytes = uploaded_file.getvalue()
+                file_hash = file_fingerprint(file_bytes)
+                with tracer.span('load_data', source='upload'):
+                    df = load_uploaded_csv(file_hash, file_bytes)
                 st.session_state['df'] = df
+                st.session_state['dataset_key'] = file_hash
                 st.session_state['available_columns'] = list(df.columns)
         
         elif input_method == "Pre-loaded Dataset":
             if st.button("Load Employee Reviews Dataset"):
                 with st.spinner('Loading dataset...'):
-                    df = load_employee_reviews()
+                    with tracer.span('load_data', source='dataset'):
+                        df = load_employee_reviews_cached()
                     st.session_state['df'] = df
+                    st.session_state['dataset_key'] = DATASET_NAME
                     st.session_state['available_columns'] = list(df.columns)
                     st.success("Dataset loaded successfully!")
         
+        st.session_state['backend'] = st.selectbox(
+            "Text scorer:", list(backend_choices()), format_func=backend_choices().get,
+            help="The review classifier needs a model trained with train_reviews.py.")
+        tracer.enabled = st.checkbox("Record timings", value=tracer.enabled,
+                                     help="Time each phase of the analysis; see Diagnostics at the bottom of the page.")
         return input_method
 
 def text_input_analysis():
     user_input = st.text_area("Enter work-life balance feedback:", height=150)
     if st.button("Analyze Text") and user_input.strip():
-        sentiment, polarity = analyze_sentiment(user_input)
+        sentiment, polarity = analyze_sentiment(user_input, backend=st.session_state['backend'])
         col1, col2 = st.columns(2)
         with col1: st.metric("Sentiment", sentiment)
         with col2: st.metric("Polarity Score", f"{polarity:.2f}")
@@ -44,6 +73,7 @@ def text_input_analysis():
 def dataset_analysis(input_method):
     if (input_method in ["CSV Upload", "Pre-loaded Dataset"]) and 'df' in st.session_state:
         df = st.session_state['df']
+        dataset_key = st.session_state['dataset_key']
         st.subheader("Analysis Setup")
         selected_column = st.selectbox(
             "Select the column to analyze:",
@@ -51,35 +81,26 @@ def dataset_analysis(input_method):
             key='column_selector'
         )
         
-        is_numeric = is_numeric_column(df[selected_column])
+        tracer = get_tracer()
+        with tracer.span('infer_column_type', column=selected_column):
+            is_numeric = is_numeric_column_cached(dataset_key, selected_column, df[selected_column])
         analysis_type = 'numeric' if is_numeric else 'text'
         
         if st.button(f"Analyze as {'Numeric Ratings' if is_numeric else 'Text Sentiment'}"):
             with st.spinner('Analyzing...'):
-                st.session_state['analysis_df'] = df.copy()
-                st.session_state['analysis_type'] = analysis_type
-                
-                if analysis_type == 'numeric':
-                    st.session_state['analysis_df']['rating'] = df[selected_column].apply(convert_to_numeric)
-                else:
-                    st.session_state['analysis_df']['sentiment'] = df[selected_column].apply(lambda x: analyze_sentiment(x)[0])
-                    st.session_state['analysis_df']['polarity'] = df[selected_column].apply(lambda x: analyze_sentiment(x)[1])
+                with tracer.span('analyze', column=selected_column, kind=analysis_type):
+                    result = analyze_column_cached(dataset_key, selected_column, analysis_type, df[selected_column],
+                                                   st.session_state['backend'], tracer)
+                tracer.count('analysis_cache_lookups')
+                tracer.count('rows_analyzed', len(df))
+                get_result_store(df).add(selected_column, result)
         
-        if 'analysis_df' in st.session_state:
-            display_analysis_results(selected_column)
+        if get_result_store(df).get(selected_column) is not None:
+            display_analysis_results(df, selected_column, analysis_type)
 
-def display_analysis_results(selected_column):
-    analysis_df = st.session_state['analysis_df']
-    st.write(f"Analyzing {len(analysis_df)} records from column: '{selected_column}'")
-    
-    if st.session_state['analysis_type'] == 'numeric':
-        display_numeric_analysis(analysis_df, selected_column)
-    else:
-        display_text_analysis(analysis_df, selected_column)
-
-def display_numeric_analysis(df, column_name):
+def display_numeric_analysis(ratings, column_name):
     st.subheader("Numeric Ratings Analysis")
-    results = analyze_numeric_ratings(df, 'rating')
+    results = analyze_numeric_ratings(ratings.to_frame(), 'rating')
     
     col1, col2 = st.columns(2)
     with col1:
@@ -90,51 +111,57 @@ def display_numeric_analysis(df, column_name):
         st.metric("Minimum Rating", results['min'])
         st.metric("Maximum Rating", results['max'])
     
-    fig, ax = plt.subplots(figsize=(10, 4))
-    sns.histplot(df['rating'], bins=20, kde=True, ax=ax)
-    ax.set_xlabel("Rating Value")
-    st.pyplot(fig)
+    tracer = get_tracer()
+    with tracer.span('generate_figure: rating histogram'):
+        fig = render_rating_histogram(st.session_state['dataset_key'], column_name, ratings)
+    with tracer.span('display: rating histogram'):
+        st.pyplot(fig)
     
     st.subheader("Rating Distribution")
     st.bar_chart(results['distribution'])
 
-def display_text_analysis(df, column_name):
+def display_text_analysis(result, column_name):
     st.subheader("Text Sentiment Analysis")
+    st.caption(f"Scored {result.unique_count} unique texts out of {result.total} "
+               f"({100*result.dedup_ratio:.1f}% duplicates)")
     
     col1, col2 = st.columns(2)
     with col1:
-        st.metric("Positive %", f"{100*(df['sentiment'] == 'Positive').mean():.1f}%")
-        st.metric("Negative %", f"{100*(df['sentiment'] == 'Negative').mean():.1f}%")
+        st.metric("Positive %", f"{100*result.share('Positive'):.1f}%")
+        st.metric("Negative %", f"{100*result.share('Negative'):.1f}%")
     
     with col2:
-        st.metric("Average Polarity", f"{df['polarity'].mean():.2f}")
-        st.metric("Neutral %", f"{100*(df['sentiment'] == 'Neutral').mean():.1f}%")
+        st.metric("Average Polarity", f"{result.mean:.2f}")
+        st.metric("Neutral %", f"{100*result.share('Neutral'):.1f}%")
     
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 4))
-    df['sentiment'].value_counts().plot(kind='pie', autopct='%1.1f%%', colors=['green', 'red', 'blue'], ax=ax1)
-    ax1.set_ylabel('')
-    sns.histplot(df['polarity'], bins=20, kde=True, ax=ax2)
-    ax2.set_xlabel("Sentiment Polarity (-1 to 1)")
-    st.pyplot(fig)
+    dataset_key = st.session_state['dataset_key']
+    tracer = get_tracer()
+    with tracer.span('generate_figure: sentiment charts'):
+        fig = render_text_charts(dataset_key, column_name, result.backend, result)
+    with tracer.span('display: sentiment charts'):
+        st.pyplot(fig)
     
     st.subheader("Word Cloud")
-    st.pyplot(generate_wordcloud(df[column_name]))
+    with tracer.span('generate_figure: word cloud'):
+        fig = render_wordcloud(dataset_key, column_name, result.backend, result)
+    with tracer.span('display: word cloud'):
+        st.pyplot(fig)
     
-def display_analysis_results(selected_column):
-    analysis_df = st.session_state['analysis_df']
-    st.write(f"Analyzing {len(analysis_df)} records from column: '{selected_column}'")
+def display_analysis_results(df, selected_column, analysis_type):
+    store = get_result_store(df)
+    st.write(f"Analyzing {len(df)} records from column: '{selected_column}'")
     
-    if st.session_state['analysis_type'] == 'numeric':
-        display_numeric_analysis(analysis_df, selected_column)
+    if analysis_type == 'numeric':
+        display_numeric_analysis(store.get(selected_column), selected_column)
     else:
-        display_text_analysis(analysis_df, selected_column)
+        display_text_analysis(store.get(selected_column), selected_column)
     
     st.subheader("Sample Data Preview")
     sample_size = st.slider("Number of samples to show", 1, 20, 5)
     sample_data = get_sample_data(
-        analysis_df, 
+        df, 
         selected_column, 
-        st.session_state['analysis_type'],
+        store.columns(selected_column),
         sample_size
     )
     st.dataframe(sample_data)
@@ -154,6 +181,22 @@ def main():
     - *Text Sentiment: Uses NLP to analyze emotional tone (-1 to 1 polarity)*
     - *Numeric Ratings: Analyzes score-based ratings (e.g., 1-5 stars)*
     """)
+    diagnostics_panel()
+
+def diagnostics_panel():
+    tracer = get_tracer()
+    with st.expander("Diagnostics"):
+        st.code(tracer.report(), language=None)
+        if 'results' in st.session_state:
+            st.code(st.session_state['results'].memory_report(), language=None)
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("Download Chrome trace", json.dumps(tracer.chrome_trace()),
+                               file_name="wlb-trace.json", mime="application/json",
+                               help="Open in chrome://tracing or ui.perfetto.dev.")
+        with col2:
+            if st.button("Clear timings"):
+                tracer.clear()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,101 @@
+"""Per-row analysis results kept beside the loaded DataFrame instead of inside it.
+
+    store = ResultStore(data)
+    store.add('Likes', analyze_text_column(data['Likes']))
+    store.frame('Likes')            # sentiment (categorical) and polarity (float32), on data's index
+    print(store.memory_report())
+
+The source frame is never modified or copied. A result keeps its labels as int8 codes and its
+scores as float32; ``frame`` turns them into columns only when something, such as an export,
+asks for them. Results are anything with a ``columns()`` method returning ``{name: values}``,
+or a Series, which is stored as the single column it already is.
+"""
+import sys
+import numpy as np
+import pandas as pd
+
+
+def format_bytes(n_bytes):
+    for unit in ("B", "KiB", "MiB"):
+        if n_bytes < 1024 or unit == "MiB":
+            return f"{n_bytes:.0f}{unit}" if unit == "B" else f"{n_bytes:.1f}{unit}"
+        n_bytes /= 1024
+
+
+def column_bytes(values):
+    """Bytes held by one derived column: the codes of a Categorical, the buffer of an array."""
+    if isinstance(values, pd.Categorical):
+        return values.codes.nbytes
+    return np.asarray(values).nbytes
+
+
+def expanded_bytes(values):
+    """What the column would cost as a float64 or object DataFrame column, counted the way
+    ``DataFrame.memory_usage(deep=True)`` counts it (a pointer plus the string per row)."""
+    if isinstance(values, pd.Categorical):
+        codes = values.codes
+        counts = np.bincount(codes[codes >= 0], minlength=len(values.categories))
+        return 8 * len(values) + sum(int(count) * sys.getsizeof(label)
+                                     for count, label in zip(counts, values.categories))
+    return 8 * len(values)
+
+
+class ResultStore:
+    """Analysis results for one loaded dataset, keyed by the analyzed column."""
+
+    def __init__(self, data=None):
+        self.data = data
+        self.results = {}
+
+    def add(self, column, result):
+        self.results[column] = result
+        return result
+
+    def get(self, column):
+        return self.results.get(column)
+
+    def clear(self):
+        self.results = {}
+
+    def columns(self, column):
+        """``{derived column name: values}`` for the result stored under ``column``."""
+        result = self.results[column]
+        if isinstance(result, pd.Series):
+            return {result.name or column: result.to_numpy()}
+        return result.columns()
+
+    def frame(self, column):
+        """The derived columns of ``column`` as a new DataFrame on the source index.
+
+        Raises ValueError for a result without per-row values (a streamed CSV).
+        """
+        columns = self.columns(column)
+        if not columns:
+            raise ValueError(f"The result for {column!r} has no per-row values to tabulate.")
+        index = self.data.index if self.data is not None else None
+        return pd.DataFrame(columns, index=index)
+
+    def memory_usage(self):
+        """``[(column, derived column, bytes held, bytes as a float64/object column)]`` for every result."""
+        rows = []
+        for column in self.results:
+            for name, values in self.columns(column).items():
+                rows.append((column, name, column_bytes(values), expanded_bytes(values)))
+        return rows
+
+    def memory_report(self):
+        """Source frame size and the derived results' size, as a plain-text table."""
+        lines = []
+        if self.data is not None:
+            lines.append(f"{'source frame (deep)':<44} {format_bytes(self.data.memory_usage(deep=True).sum()):>12}")
+        rows = self.memory_usage()
+        if not rows:
+            lines.append("(no per-row results stored)")
+            return "\n".join(lines)
+        lines.append(f"{'derived column':<44} {'held':>12} {'as columns':>12}")
+        for column, name, held, expanded in rows:
+            lines.append(f"{f'{column}:{name}':<44} {format_bytes(held):>12} {format_bytes(expanded):>12}")
+        held = sum(row[2] for row in rows)
+        expanded = sum(row[3] for row in rows)
+        lines.append(f"{'total':<44} {format_bytes(held):>12} {format_bytes(expanded):>12}")
+        return "\n".join(lines)
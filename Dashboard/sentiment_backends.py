@@ -0,0 +1,197 @@
+"""Text sentiment scorers behind one batch interface, plus the layers every frontend shares.
+
+Each backend implements ``score_batch(texts) -> (labels, scores)``, its own label thresholds
+and a CostProfile. ``score_unique_texts`` and ``score_texts`` add de-duplication, the on-disk
+score cache and the process pool on top of any backend, using the cost profile to skip the
+layers that would cost more than they save.
+"""
+import abc
+import functools
+import importlib.metadata
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+from parallel_scoring import score_in_parallel, DEFAULT_CHUNK_SIZE
+from polarity_cache import PolarityCache, DEFAULT_CACHE_PATH
+
+SENTIMENT_LABELS = ['Negative', 'Neutral', 'Positive']
+BACKEND_TEXTBLOB = 'textblob'
+BACKEND_VADER = 'vader'
+BACKEND_CLASSIFIER = 'classifier'
+
+# Rough figures for one process: seconds to import and load the model, and texts scored per
+# second once loaded. ``parallel`` is False when a process pool cannot beat one vectorized call.
+CostProfile = namedtuple('CostProfile', ['load_seconds', 'texts_per_second', 'parallel'])
+# A SQLite lookup costs about as much as scoring a text at this rate, so faster backends are
+# not cached.
+CACHE_TEXTS_PER_SECOND = 50_000
+
+BACKENDS = {}
+
+
+def register_backend(cls):
+    """Class decorator adding a backend to BACKENDS under its ``name``.
+
+    Raises TypeError at import time for a backend that leaves an abstract method unimplemented.
+    """
+    if cls.__abstractmethods__:
+        raise TypeError(f"Backend {cls.__name__} does not implement {', '.join(sorted(cls.__abstractmethods__))}.")
+    BACKENDS[cls.name] = cls
+    return cls
+
+
+class SentimentBackend(abc.ABC):
+    """Base class: subclasses set ``name``, ``label``, ``cost`` and implement ``score`` and ``version``.
+
+    Scores below ``negative_below`` are Negative, scores up to ``positive_above`` Neutral and the
+    rest (including NaN) Positive.
+    """
+    name = None
+    label = None
+    cost = None
+    # Analyzer name in the score cache; kept from before the registry so old entries still hit.
+    cache_name = None
+    negative_below = -0.1
+    positive_above = 0.1
+
+    @property
+    def cacheable(self):
+        """False when scoring a text is cheaper than looking it up in the score cache."""
+        return self.cost.texts_per_second < CACHE_TEXTS_PER_SECOND
+
+    @abc.abstractmethod
+    def version(self):
+        """Identifies the scorer's data for the score cache; changes whenever scores could change."""
+
+    @abc.abstractmethod
+    def score(self, texts):
+        """One float score per string."""
+
+    def codes(self, scores):
+        """Label scores as int8 codes into SENTIMENT_LABELS."""
+        scores = np.asarray(scores, dtype=float)
+        return np.select([scores < self.negative_below, scores <= self.positive_above], [0, 1], default=2).astype(np.int8)
+
+    def score_batch(self, texts):
+        """``(labels, scores)`` for a list of strings, labels as an object array of SENTIMENT_LABELS."""
+        scores = np.asarray(self.score(texts), dtype=float)
+        return np.array(SENTIMENT_LABELS, dtype=object)[self.codes(scores)], scores
+
+
+@register_backend
+class TextBlobBackend(SentimentBackend):
+    name = BACKEND_TEXTBLOB
+    label = 'TextBlob'
+    cache_name = 'textblob-pattern'
+    cost = CostProfile(load_seconds=1.5, texts_per_second=20_000, parallel=True)
+
+    def version(self):
+        # Package metadata, because TextBlob releases after 0.17 dropped ``textblob.__version__``.
+        return importlib.metadata.version('textblob')
+
+    def score(self, texts):
+        from sentiment_lexicon import get_scorer
+        return get_scorer().score(texts)
+
+
+@register_backend
+class VaderBackend(SentimentBackend):
+    name = BACKEND_VADER
+    label = 'VADER'
+    cache_name = 'nltk-vader'
+    cost = CostProfile(load_seconds=2.0, texts_per_second=15_000, parallel=True)
+
+    def version(self):
+        import nltk
+        return nltk.__version__
+
+    def score(self, texts):
+        from vader_scoring import score_compound
+        return score_compound(texts)
+
+    def codes(self, scores):
+        # VADER's usual cut-offs are inclusive at +/-0.05.
+        scores = np.asarray(scores, dtype=float)
+        return np.select([scores <= -0.05, scores < 0.05], [0, 1], default=2).astype(np.int8)
+
+
+@register_backend
+class ClassifierBackend(SentimentBackend):
+    """The Naive Bayes model saved by train_reviews.py; scores are P(pos) - P(neg)."""
+    name = BACKEND_CLASSIFIER
+    label = 'Review classifier'
+    cost = CostProfile(load_seconds=0.2, texts_per_second=400_000, parallel=False)
+
+    def version(self):
+        from review_classifier import get_classifier, MODEL_FORMAT
+        return f"{MODEL_FORMAT}-{get_classifier().metadata.get('trained_at')}"
+
+    def score(self, texts):
+        from review_classifier import classifier_polarity
+        return classifier_polarity(texts)
+
+
+_instances = {}
+
+
+def get_backend(name):
+    """Return the process-wide instance of the backend registered as ``name``."""
+    if name not in _instances:
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown sentiment backend {name!r}; choose from {', '.join(BACKENDS)}.")
+        _instances[name] = BACKENDS[name]()
+    return _instances[name]
+
+
+def backend_choices():
+    """``{name: label}`` for every registered backend, in registration order."""
+    return {name: cls.label for name, cls in BACKENDS.items()}
+
+
+def open_score_cache(name, path=DEFAULT_CACHE_PATH):
+    """Open the on-disk score cache for a backend, or return None when it scores faster than a lookup."""
+    backend = get_backend(name)
+    if not backend.cacheable:
+        return None
+    return PolarityCache(backend.cache_name or backend.name, backend.version(), path)
+
+
+def score_chunk(name, texts):
+    """Scores from backend ``name``; module-level so process pool workers can run it."""
+    return get_backend(name).score(texts)
+
+
+def score_unique_texts(name, texts, workers=1, chunk_size=DEFAULT_CHUNK_SIZE, cache=None, progress=None):
+    """Scores for a list of already de-duplicated strings, using the cache and process pool if given.
+
+    ``progress``, if given, is called as ``progress(fraction_done, texts_done)``; cache hits count
+    as done before any scoring starts. Backends whose cost profile says a pool does not pay off
+    are scored in this process whatever ``workers`` is.
+    """
+    if not get_backend(name).cost.parallel:
+        workers = 1
+
+    def score_misses(batch):
+        chunk_progress = None
+        if progress is not None:
+            # Only cache misses reach here; everything else in ``texts`` is already done.
+            offset = len(texts) - len(batch)
+            chunk_progress = lambda done: progress((offset + done) / len(texts), offset + done)
+        return score_in_parallel(batch, functools.partial(score_chunk, name), workers=workers,
+                                 chunk_size=chunk_size, progress=chunk_progress)
+
+    if cache is not None:
+        return np.asarray(cache.score(texts, score_misses), dtype=float)
+    return score_misses(texts)
+
+
+def score_texts(name, texts, workers=1, chunk_size=DEFAULT_CHUNK_SIZE, cache=None, progress=None):
+    """Scores for every string in ``texts``; identical texts are scored once and broadcast back."""
+    codes, uniques = pd.factorize(pd.Series(list(texts), dtype=object))
+    return score_unique_texts(name, uniques.tolist(), workers, chunk_size, cache, progress)[codes]
+
+
+def score_batch(name, texts, workers=1, chunk_size=DEFAULT_CHUNK_SIZE, cache=None, progress=None):
+    """``(labels, scores)`` for every string in ``texts`` through the shared layers."""
+    scores = score_texts(name, texts, workers, chunk_size, cache, progress)
+    return np.array(SENTIMENT_LABELS, dtype=object)[get_backend(name).codes(scores)], scores
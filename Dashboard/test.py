@@ -3,12 +3,12 @@ import tkinter as tk
 from tkinter import filedialog, ttk
 import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
 from analysis_function import *
 from utils import *
 from config import *
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from wordcloud import WordCloud
+from wordcloud_cache import get_wordcloud_cache
+from sentiment_backends import backend_choices
 
 class WorkLifeBalanceApp(ctk.CTk):
     def __init__(self):
@@ -18,6 +18,7 @@ class WorkLifeBalanceApp(ctk.CTk):
         ctk.set_appearance_mode("dark")
         
         self.df = None
+        self.result = None
         self.selected_column = None
         
         self.create_widgets()
@@ -32,9 +33,16 @@ class WorkLifeBalanceApp(ctk.CTk):
         self.content_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=10, pady=10)
         self.label.pack(pady=10)
         self.input_method.pack(pady=10)
+        # Text scorer for each run, listed by label; the classifier needs a model from train_reviews.py.
+        self.backend_label = ctk.CTkLabel(self.menu_frame, text="Text scorer")
+        self.backend_selector = ctk.CTkComboBox(self.menu_frame, values=list(backend_choices().values()), state="readonly")
+        self.backend_selector.set(next(iter(backend_choices().values())))
+        self.backend_label.pack(pady=(10, 0))
+        self.backend_selector.pack(pady=5)
 
         self.column_selector = None
         self.analyze_column_btn = None
+        self.dedup_label = None
         self.chart_tabview = None
     
     def handle_input(self, choice):
@@ -69,10 +77,22 @@ class WorkLifeBalanceApp(ctk.CTk):
     def analyze_column(self):
         self.selected_column = self.column_selector.get()
         if self.selected_column:
-            self.df['sentiment'] = self.df[self.selected_column].apply(lambda x: analyze_sentiment(str(x))[0])
-            self.df['polarity'] = self.df[self.selected_column].apply(lambda x: analyze_sentiment(str(x))[1])
+            self.result = analyze_text_column(self.df[self.selected_column], self.selected_backend())
+            self.show_dedup_report()
             self.create_chart_tabview()
     
+    def selected_backend(self):
+        labels = {label: name for name, label in backend_choices().items()}
+        return labels[self.backend_selector.get()]
+    
+    def show_dedup_report(self):
+        if self.dedup_label:
+            self.dedup_label.destroy()
+        report = (f"{self.result.unique_count} unique of {self.result.total} texts\n"
+                  f"({100*self.result.dedup_ratio:.1f}% duplicates)")
+        self.dedup_label = ctk.CTkLabel(self.menu_frame, text=report)
+        self.dedup_label.pack(pady=5)
+    
     def create_chart_tabview(self):
         if self.chart_tabview:
             self.chart_tabview.destroy()
@@ -87,7 +107,7 @@ class WorkLifeBalanceApp(ctk.CTk):
         self.display_wordcloud()
     
     def display_pie_chart(self):
-        sentiment_counts = self.df['sentiment'].value_counts()
+        sentiment_counts = self.result.value_counts()
         labels = sentiment_counts.index.tolist()
         sizes = sentiment_counts.values.tolist()
         colors = ['green', 'red', 'blue']
@@ -100,8 +120,8 @@ class WorkLifeBalanceApp(ctk.CTk):
         canvas.draw()
     
     def display_wordcloud(self):
-        text = ' '.join(self.df[self.selected_column].dropna().astype(str))
-        wordcloud = WordCloud(width=400, height=200, background_color='white').generate(text)
+        frequencies = self.result.word_index.combined() or {"No data available.": 1}
+        wordcloud = get_wordcloud_cache().render(frequencies, 400, 200, 'white')
         fig, ax = plt.subplots()
         ax.imshow(wordcloud, interpolation='bilinear')
         ax.axis("off")
@@ -1,11 +1,11 @@
 import pandas as pd
 import numpy as np
-from datasets import load_dataset
 from config import DATASET_NAME  
+from dataset_snapshot import load_snapshot
+from column_types import infer_column_type, NUMERIC
 
-def load_employee_reviews():
-    dataset = load_dataset(DATASET_NAME)
-    return pd.DataFrame(dataset['train'])
+def load_employee_reviews(columns=None):
+    return load_snapshot(DATASET_NAME, columns)
 
 def convert_to_numeric(rating):
     try:
@@ -13,6 +13,10 @@ def convert_to_numeric(rating):
     except (ValueError, TypeError):
         return np.nan
 
+def to_numeric(series):
+    """Vectorized convert_to_numeric for a whole column."""
+    return pd.to_numeric(series, errors='coerce')
+
 def is_numeric_column(series):
-    numeric_vals = series.apply(convert_to_numeric)
-    return numeric_vals.notna().mean() > 0.8
\ No newline at end of file
+    """Decided from a random sample of the column, not a full scan."""
+    return infer_column_type(series) == NUMERIC
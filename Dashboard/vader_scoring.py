@@ -0,0 +1,42 @@
+from vader_batch import BatchVaderScorer
+
+_analyzer = None
+_batch_scorer = None
+VADER_RESOURCE = 'sentiment/vader_lexicon.zip'
+
+
+def vader_lexicon_available():
+    """True when the VADER lexicon is installed locally; never downloads it."""
+    import nltk
+    try:
+        nltk.data.find(VADER_RESOURCE)
+    except LookupError:
+        return False
+    return True
+
+
+def get_analyzer():
+    """Return the process-wide VADER analyzer, loading the lexicon on first use."""
+    global _analyzer
+    if _analyzer is None:
+        # NLTK is slow to import, so it is loaded here rather than when the GUI starts.
+        from nltk.sentiment import SentimentIntensityAnalyzer
+        _analyzer = SentimentIntensityAnalyzer()
+    return _analyzer
+
+
+def get_batch_scorer():
+    """Return the process-wide batch scorer built from ``get_analyzer()``'s tables."""
+    global _batch_scorer
+    if _batch_scorer is None:
+        _batch_scorer = BatchVaderScorer(get_analyzer())
+    return _batch_scorer
+
+
+def score_compound(texts):
+    """VADER compound score for a list of strings; module-level so pool workers can run it.
+
+    Same values as ``polarity_scores(text)['compound']``, via ``BatchVaderScorer``.
+    """
+    return get_batch_scorer().score(texts)
+
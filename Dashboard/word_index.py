@@ -0,0 +1,78 @@
+import re
+from collections import Counter, defaultdict
+from operator import itemgetter
+
+# WordCloud.process_text's pattern for its default min_word_length of 0 (one-letter words count).
+TOKEN_PATTERN = re.compile(r"\w[\w']*")
+
+
+def default_stopwords():
+    """WordCloud's stopword list; imported on first use so wordcloud stays off the startup path."""
+    from wordcloud import STOPWORDS
+    return STOPWORDS
+
+
+def tokenize(text, stopwords=None):
+    """Word-cloud tokens of ``text`` in their original case, with stopwords, numbers and trailing 's
+    removed as WordCloud.process_text removes them."""
+    if stopwords is None:
+        stopwords = default_stopwords()
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text):
+        if token.lower().endswith("'s"):
+            token = token[:-2]
+        if not token.isdigit() and token.lower() not in stopwords:
+            tokens.append(token)
+    return tokens
+
+
+def fold_tokens(counts):
+    """WordCloud's ``process_tokens`` over token counts instead of a token list.
+
+    Case variants are merged under their most common spelling, and a word ending in "s" (but not
+    "ss") is merged into its singular when the singular also occurs.
+    """
+    cases = defaultdict(dict)
+    for token, count in counts.items():
+        cases[token.lower()][token] = count
+    for key in list(cases):
+        if key.endswith('s') and not key.endswith('ss') and key[:-1] in cases:
+            singular = cases[key[:-1]]
+            for token, count in cases.pop(key).items():
+                singular[token[:-1]] = singular.get(token[:-1], 0) + count
+    # max() keeps the first spelling on ties, as process_tokens does with first-seen order.
+    return {max(variants.items(), key=itemgetter(1))[0]: sum(variants.values()) for variants in cases.values()}
+
+
+class WordFrequencyIndex:
+    """Token counts per sentiment code, updatable chunk by chunk.
+
+    Feeds ``WordCloud.generate_from_frequencies`` so clouds never need the whole column joined
+    into one string.
+    """
+
+    def __init__(self, n_classes=3, stopwords=None):
+        self.stopwords = stopwords if stopwords is not None else default_stopwords()
+        self.counters = [Counter() for _ in range(n_classes)]
+
+    def update(self, texts, codes, occurrences=None):
+        """Count the tokens of each text under its sentiment code, weighted by ``occurrences``."""
+        if occurrences is None:
+            occurrences = [1] * len(texts)
+        for text, code, count in zip(texts, codes, occurrences):
+            if not count:
+                continue
+            counter = self.counters[code]
+            for token in tokenize(text, self.stopwords):
+                counter[token] += int(count)
+
+    def frequencies(self, code):
+        """Word-cloud frequencies for one class, normalized the way WordCloud.generate would."""
+        return fold_tokens(self.counters[code])
+
+    def combined(self):
+        """Word-cloud frequencies over every class, for a single cloud of the whole column."""
+        total = Counter()
+        for counter in self.counters:
+            total.update(counter)
+        return fold_tokens(total)
@@ -1,10 +1,24 @@
+import numpy as np
 import pandas as pd
-from textblob import TextBlob
-from sklearn.preprocessing import MinMaxScaler
+from parallel_scoring import DEFAULT_CHUNK_SIZE
+from word_index import WordFrequencyIndex
+from diagnostics import DISABLED_TRACER
+from sentiment_backends import (SENTIMENT_LABELS, BACKEND_TEXTBLOB, get_backend,
+                                score_unique_texts as score_with_backend)
 
-def analyze_sentiment(text):
-    """Analyze sentiment using TextBlob and return (sentiment, polarity)."""
-    polarity = TextBlob(str(text)).sentiment.polarity
+# Per-row scores are polarities in [-1, 1] or small ratings, so float32 holds them at half the size.
+SCORE_DTYPE = np.float32
+
+def analyze_sentiment(text, cache=None, backend=BACKEND_TEXTBLOB):
+    """Analyze sentiment using TextBlob (or another registered backend) and return (sentiment, polarity)."""
+    if backend != BACKEND_TEXTBLOB:
+        polarity = float(score_with_backend(backend, [str(text)], cache=cache)[0])
+        return SENTIMENT_LABELS[get_backend(backend).codes([polarity])[0]], polarity
+    from textblob import TextBlob
+    if cache is not None:
+        polarity = cache.score([str(text)], lambda texts: [TextBlob(t).sentiment.polarity for t in texts])[0]
+    else:
+        polarity = TextBlob(str(text)).sentiment.polarity
     if polarity > 0.1:
         sentiment = 'Positive'
     elif polarity < -0.1:
@@ -13,6 +27,236 @@ def analyze_sentiment(text):
         sentiment = 'Neutral'
     return sentiment, polarity
 
+def polarity_codes(polarity):
+    """Vectorized analyze_sentiment thresholds, returned as codes into SENTIMENT_LABELS."""
+    polarity = np.asarray(polarity, dtype=float)
+    return np.select([polarity < -0.1, polarity <= 0.1], [0, 1], default=2).astype(np.int8)
+
+def label_polarity(polarity):
+    """Vectorized version of the analyze_sentiment thresholds for an array of polarities."""
+    return np.array(SENTIMENT_LABELS, dtype=object)[polarity_codes(polarity)]
+
+def deduplicate_texts(series):
+    """Normalize whitespace and factorize a column so each distinct text is scored only once.
+
+    Returns ``(codes, uniques)``; ``uniques[codes]`` rebuilds the normalized column.
+    """
+    texts = pd.Series(series).astype(str).str.replace(r'\s+', ' ', regex=True).str.strip()
+    codes, uniques = pd.factorize(texts)
+    return codes, uniques.tolist()
+
+def score_unique_texts(texts, workers=1, chunk_size=DEFAULT_CHUNK_SIZE, cache=None, progress=None,
+                       backend=BACKEND_TEXTBLOB):
+    """Scores for a list of already de-duplicated strings, using the cache and process pool if given.
+
+    ``progress``, if given, is called as ``progress(fraction_done, texts_done)``; cache hits count
+    as done before any scoring starts. ``cache`` must come from ``open_score_cache(backend)``.
+    """
+    return score_with_backend(backend, texts, workers, chunk_size, cache, progress)
+
+def index_words(series, codes, uniques, unique_codes, word_index=None):
+    """Count the word-cloud tokens of each distinct text under its sentiment code.
+
+    Every text is tokenized once and weighted by the number of non-missing rows that share it,
+    so one pass fills the positive, neutral and negative clouds together.
+    """
+    if word_index is None:
+        word_index = WordFrequencyIndex()
+    present = pd.Series(series).notna().to_numpy()
+    occurrences = np.bincount(codes[present], minlength=len(uniques))
+    word_index.update(uniques, unique_codes, occurrences)
+    return word_index
+
+def score_polarity(series, workers=1, chunk_size=DEFAULT_CHUNK_SIZE, cache=None, backend=BACKEND_TEXTBLOB):
+    """Return the ``backend`` polarity of every value in a column as a NumPy array.
+
+    Only distinct texts are scored and the results are broadcast back to every row. With
+    ``workers`` other than 1 large columns are split into ``chunk_size`` chunks and scored on a
+    process pool (0 means one worker per CPU). With a ``cache`` only texts that were not scored
+    in an earlier run are computed.
+    """
+    codes, uniques = deduplicate_texts(series)
+    return score_unique_texts(uniques, workers, chunk_size, cache, backend=backend)[codes]
+
+def analyze_sentiment_batch(series, workers=1, chunk_size=DEFAULT_CHUNK_SIZE, cache=None, backend=BACKEND_TEXTBLOB):
+    """Score a whole column at once through ``backend`` and return (labels, polarity) as NumPy arrays.
+
+    Each row gets what ``analyze_sentiment(text, backend=backend)`` returns: scores and label
+    thresholds come from the backend, so VADER and the classifier do not match TextBlob's output.
+    """
+    polarity = score_polarity(series, workers, chunk_size, cache, backend)
+    return np.array(SENTIMENT_LABELS, dtype=object)[get_backend(backend).codes(polarity)], polarity
+
+class AnalysisResult:
+    """Everything the charts and summaries need from one analysis pass over a column.
+
+    Labels are stored as int8 codes into SENTIMENT_LABELS. ``scores`` holds the polarity for text
+    columns and the raw rating for numeric columns; ``mean`` and ``histogram`` are taken over it
+    at full precision, then ``scores`` and ``scaled`` are kept as SCORE_DTYPE.
+    """
+
+    def __init__(self, kind, codes, scores, index=None, scaled=None, unique_count=None, bins=20, hist_range=None,
+                 word_index=None):
+        self.kind = kind
+        self.unique_count = unique_count
+        self.word_index = word_index
+        self.codes = np.asarray(codes, dtype=np.int8)
+        self.index = index if index is not None else pd.RangeIndex(len(self.codes))
+        self.counts = pd.Series(np.bincount(self.codes, minlength=len(SENTIMENT_LABELS)), index=SENTIMENT_LABELS)
+        self.total = int(self.counts.sum())
+        scores = np.asarray(scores, dtype=float)
+        valid = scores[~np.isnan(scores)]
+        self.mean = float(valid.mean()) if len(valid) else float('nan')
+        self.histogram = np.histogram(valid, bins=bins, range=hist_range)
+        self.scores = scores.astype(SCORE_DTYPE)
+        self.scaled = None if scaled is None else np.asarray(scaled, dtype=SCORE_DTYPE)
+
+    @classmethod
+    def from_aggregates(cls, kind, counts, mean, histogram, unique_count=None, word_index=None):
+        """Build a result from running totals (streaming mode), without per-row codes or scores."""
+        result = cls.__new__(cls)
+        result.kind = kind
+        result.unique_count = unique_count
+        result.word_index = word_index
+        result.codes = None
+        result.scores = None
+        result.scaled = None
+        result.index = None
+        result.counts = pd.Series(np.asarray(counts, dtype=np.int64), index=SENTIMENT_LABELS)
+        result.total = int(result.counts.sum())
+        result.mean = mean
+        result.histogram = histogram
+        return result
+
+    @property
+    def streamed(self):
+        """True when only aggregates are available (no per-row codes or scores)."""
+        return self.codes is None
+
+    @property
+    def labels(self):
+        return np.array(SENTIMENT_LABELS, dtype=object)[self.codes]
+
+    def columns(self):
+        """The per-row results as ``{column name: values}``, labels as a Categorical over the codes.
+
+        The names are the ones the apps used to add to the loaded DataFrame; streamed results have none.
+        """
+        if self.streamed:
+            return {}
+        labels = pd.Categorical.from_codes(self.codes, SENTIMENT_LABELS)
+        if self.kind == 'numeric':
+            return {'numeric': self.scores, 'scaled': self.scaled, 'rating_sentiment': labels}
+        return {'sentiment': labels, 'polarity': self.scores}
+
+    def value_counts(self):
+        """Non-zero label counts, most frequent first (like Series.value_counts)."""
+        counts = self.counts[self.counts > 0]
+        return counts.sort_values(ascending=False, kind='stable')
+
+    @property
+    def dedup_ratio(self):
+        """Share of rows that were duplicates of an already scored text (0 when not tracked)."""
+        if not self.unique_count or not self.total:
+            return 0.0
+        return 1 - self.unique_count / self.total
+
+    def percentage(self, label):
+        return (self.counts[label] / self.total) * 100 if self.total else 0.0
+
+def analyze_text_column(series, workers=1, chunk_size=DEFAULT_CHUNK_SIZE, cache=None, progress=None,
+                        backend=BACKEND_TEXTBLOB, tracer=DISABLED_TRACER):
+    """Score a text column once and wrap the result, with its per-class word counts, for charts and summaries.
+
+    ``tracer`` (a diagnostics.Tracer) times the de-duplication, scoring and word counting separately.
+    """
+    with tracer.span('deduplicate_texts', rows=len(series)):
+        codes, uniques = deduplicate_texts(series)
+    with tracer.span('score_unique_texts', texts=len(uniques), backend=backend):
+        unique_polarity = score_unique_texts(uniques, workers, chunk_size, cache, progress, backend)
+        unique_codes = get_backend(backend).codes(unique_polarity)
+    with tracer.span('index_words', texts=len(uniques)):
+        word_index = index_words(series, codes, uniques, unique_codes)
+    tracer.count('rows_scored', len(series))
+    tracer.count('unique_texts', len(uniques))
+    polarity = unique_polarity[codes]
+    return AnalysisResult('text', unique_codes[codes], polarity, index=pd.Series(series).index,
+                          unique_count=len(uniques), hist_range=(-1, 1), word_index=word_index)
+
+def is_percent_column(series):
+    """More than 80% of the values are written as percentages."""
+    return series.astype(str).str.contains('%').mean() > 0.8
+
+def to_numeric_values(series, is_percent):
+    """Parse a column to floats (percentages become fractions); unparseable values become NaN."""
+    if is_percent:
+        return pd.to_numeric(series.astype(str).str.rstrip('%'), errors='coerce') / 100.0
+    return pd.to_numeric(series, errors='coerce')
+
+SCALE_FIT = 'fit'
+SCALE_RUNNING = 'running'
+SCALE_FIXED = 'fixed'
+# Rating columns with a declared scale are scaled against it rather than the observed min/max.
+RATING_RANGES = {'work_life_balance': (1, 5)}
+
+class RatingScaler:
+    """Min-max scale ratings to [-1, 1] without sklearn, chunk by chunk if needed.
+
+    ``mode`` is SCALE_FIXED (a declared ``value_range``), SCALE_RUNNING (the min/max seen so far,
+    widened by every ``partial_fit``) or SCALE_FIT (fit on the whole column, as MinMaxScaler did).
+    """
+
+    def __init__(self, mode=SCALE_FIT, value_range=None):
+        if mode == SCALE_FIXED and value_range is None:
+            raise ValueError("Fixed scaling needs a value_range.")
+        self.mode = mode
+        self.low, self.high = value_range if value_range is not None else (np.nan, np.nan)
+
+    def partial_fit(self, values):
+        if self.mode == SCALE_FIXED:
+            return self
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.low = np.fmin(self.low, values.min())
+            self.high = np.fmax(self.high, values.max())
+        return self
+
+    def fit(self, values):
+        if self.mode != SCALE_FIXED:
+            self.low, self.high = np.nan, np.nan
+        return self.partial_fit(values)
+
+    def transform(self, values):
+        # A constant column maps to -1, like MinMaxScaler.
+        span = (self.high - self.low) or 1.0
+        scaled = (np.asarray(values, dtype=float) - self.low) * 2 / span - 1
+        if isinstance(values, pd.Series):
+            return pd.Series(scaled, index=values.index)
+        return scaled
+
+    def fit_transform(self, values):
+        return self.fit(values).transform(values)
+
+def rating_scaler(column=None, mode=None):
+    """Fixed scaling for columns with a declared range, otherwise ``mode`` (fit-on-all by default)."""
+    if mode in (None, SCALE_FIXED) and column in RATING_RANGES:
+        return RatingScaler(SCALE_FIXED, RATING_RANGES[column])
+    return RatingScaler(mode or SCALE_FIT)
+
+def rating_codes(scaled):
+    """Label scaled ratings as codes into SENTIMENT_LABELS (NaN falls through to Positive, as before)."""
+    scaled = np.asarray(scaled, dtype=float)
+    return np.select([scaled <= -0.1, scaled <= 0.1], [0, 1], default=2).astype(np.int8)
+
+def analyze_numeric_column(numeric_vals, scaler=None):
+    """Scale numeric ratings to [-1, 1], label them and wrap the result for charts and summaries."""
+    if scaler is None:
+        scaler = RatingScaler()
+    scaled = np.asarray(scaler.fit_transform(numeric_vals), dtype=float)
+    codes = rating_codes(scaled)
+    return AnalysisResult('numeric', codes, numeric_vals, index=numeric_vals.index, scaled=scaled)
+
 def analyze_numeric_ratings(df, col):
     """Calculate basic statistics and distribution for numeric data."""
     results = {
@@ -24,7 +268,11 @@ def analyze_numeric_ratings(df, col):
     }
     return results
 
-def generate_predefined_summary_numeric(positive_pct, neutral_pct, negative_pct, average_rating):
+def generate_predefined_summary_numeric(result):
+    positive_pct = result.percentage('Positive')
+    neutral_pct = result.percentage('Neutral')
+    negative_pct = result.percentage('Negative')
+    average_rating = result.mean
     summary = "Work-Life Balance Analysis:\n"
     summary += f"- Positive Responses: {positive_pct:.1f}%\n"
     summary += f"- Neutral Responses: {neutral_pct:.1f}%\n"
@@ -67,16 +315,14 @@ def generate_predefined_summary_numeric(positive_pct, neutral_pct, negative_pct,
         summary += "\n\nNote: A high proportion of negative responses indicates widespread dissatisfaction that should be urgently addressed."
     return summary
 
-def generate_predefined_summary_text(sentiment_counts, avg_polarity):
+def generate_predefined_summary_text(result):
+    sentiment_counts = result.value_counts().to_dict()
+    avg_polarity = result.mean
     summary = "Work-Life Balance Analysis:\n"
     summary += f"- Sentiment Breakdown: {sentiment_counts}\n"
     summary += f"- Average Sentiment Polarity: {avg_polarity:.2f}\n\n"
 
-    positive = sentiment_counts.get('Positive', 0)
-    neutral = sentiment_counts.get('Neutral', 0)
-    negative = sentiment_counts.get('Negative', 0)
-    total = positive + neutral + negative
-    negative_pct = (negative / total) * 100 if total else 0
+    negative_pct = result.percentage('Negative')
 
     if avg_polarity >= 0.5:
         summary += ("Highly positive sentiment indicates employees feel very supported.\n\n"
@@ -103,10 +349,7 @@ def generate_predefined_summary_text(sentiment_counts, avg_polarity):
     return summary
 
 def scale_numbers(col):
-    scaler = MinMaxScaler(feature_range=(-1,1))
-    is_numeric = pd.api.types.is_numeric_dtype(col)
-    if is_numeric:
-        col_scaled_values = scaler.fit_transform(col.values.reshape(-1,1))
-        col_scaled = pd.DataFrame(col_scaled_values, columns=["data_scaled"], index=col.index)
-        return col_scaled
+    """Min-max scale a numeric column to [-1, 1] as a Series, or None for non-numeric columns."""
+    if pd.api.types.is_numeric_dtype(col):
+        return RatingScaler().fit_transform(col)
     return None
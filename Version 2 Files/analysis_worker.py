@@ -0,0 +1,61 @@
+import queue
+import threading
+import time
+
+
+class AnalysisCancelled(Exception):
+    """Raised inside a running analysis once the user has asked to cancel it."""
+
+
+class AnalysisWorker:
+    """Run one analysis on a background thread and hand its progress back to the Tk thread.
+
+    ``task`` is called on the worker thread as ``task(progress)`` and must not touch Tk or
+    pyplot; ``progress(fraction_done, rows_done)`` queues an update and raises
+    AnalysisCancelled once ``cancel()`` has been called. The Tk side drains the queue with
+    ``poll()`` from an ``after()`` callback.
+    """
+
+    def __init__(self, task):
+        self.task = task
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.started = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.thread.start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def progress(self, fraction, rows):
+        if self.cancel_event.is_set():
+            raise AnalysisCancelled()
+        self.events.put(('progress', (fraction, rows)))
+
+    def run(self):
+        try:
+            result = self.task(self.progress)
+        except AnalysisCancelled:
+            self.events.put(('cancelled', None))
+        except Exception as e:
+            self.events.put(('error', e))
+        else:
+            self.events.put(('done', result))
+
+    def poll(self):
+        """Return the events queued since the last call, oldest first."""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def rate(self, fraction, rows):
+        """Return ``(rows_per_second, eta_seconds)`` for a progress update; ETA is None until known."""
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        eta = elapsed * (1 - fraction) / fraction if fraction > 0 else None
+        return rows / elapsed, eta
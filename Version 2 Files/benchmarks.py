@@ -0,0 +1,233 @@
+"""Benchmarks for the analysis, chart and summary functions on synthetic reviews.
+
+    python benchmarks.py                                     # 1k, 100k and 1M rows
+    python benchmarks.py --sizes 1000 100000 --only chart --json results.json
+    python benchmarks.py --baseline results.json --max-slowdown 1.3
+
+Inputs come from ``synthetic_reviews.generate_reviews`` with a fixed seed and are built before
+the clock starts. Each case reports the best of ``--repeat`` timed runs as rows/sec (cases
+faster than MIN_TIMED_SECONDS are called in a loop, as timeit does), then runs
+once more under tracemalloc for its peak Python and NumPy allocation (buffers allocated inside
+C libraries, such as Agg's canvas, are not seen). Charts are drawn on the Agg canvas so the
+render is timed too, and word clouds are rendered into an empty cache every run. Cases that
+call a function once per row, or hand WordCloud the raw text, stop at their ``max_rows``.
+
+With ``--baseline`` the exit status is 1 when any case that appears in both runs is more than
+``--max-slowdown`` times slower or ``--max-memory-growth`` times larger, so the check can run in CI.
+"""
+import argparse
+import functools
+import json
+import math
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+import wordcloud_cache
+from synthetic_reviews import generate_reviews
+from column_types import infer_column_type, NUMERIC
+from analysis_function import (analyze_sentiment, analyze_text_column, analyze_numeric_column, analyze_numeric_ratings,
+                               rating_scaler, scale_numbers, generate_predefined_summary_numeric,
+                               generate_predefined_summary_text)
+from data_visuals import (generate_pie_chart, generate_sentiment_pie_chart, generate_scatter_plot,
+                          generate_sentiment_scatter_plot, generate_distribution_chart, generate_bar_chart_text,
+                          generate_bar_chart_numeric, generate_wordcloud, generate_wordcloud_from_frequencies)
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+TEXT_COLUMN = 'Likes'
+RATING_COLUMN = 'work_life_balance'
+SEED = 0
+MIN_TIMED_SECONDS = 0.05
+
+# ``prepare(fixtures)`` returns the arguments for ``run`` and is not timed.
+Benchmark = namedtuple('Benchmark', ['name', 'prepare', 'run', 'max_rows'], defaults=[None])
+
+
+class Fixtures:
+    """Synthetic inputs for one row count, built on first use and shared by every case."""
+
+    def __init__(self, n_rows, seed=SEED, render_dir=None):
+        self.n_rows = n_rows
+        self.render_dir = render_dir
+        self.frame = generate_reviews(n_rows, seed)
+
+    @functools.cached_property
+    def texts(self):
+        return self.frame[TEXT_COLUMN]
+
+    @functools.cached_property
+    def ratings(self):
+        return self.frame[RATING_COLUMN]
+
+    @functools.cached_property
+    def text_result(self):
+        return analyze_text_column(self.texts)
+
+    @functools.cached_property
+    def numeric_result(self):
+        return analyze_numeric_column(self.ratings, rating_scaler(RATING_COLUMN))
+
+    @functools.cached_property
+    def joined_text(self):
+        return " ".join(self.texts.dropna())
+
+
+def draw(make_figure):
+    """Wrap a ``generate_*`` function so a run also renders the figure, then closes it."""
+    def run(*args):
+        fig = make_figure(*args)
+        fig.canvas.draw()
+        plt.close(fig)
+    run.__name__ = make_figure.__name__
+    return run
+
+
+def cold_wordcloud_cache(render_dir):
+    """Point the word-cloud render cache at a new empty directory so the layout is not read from disk."""
+    wordcloud_cache._cache = wordcloud_cache.WordCloudCache(tempfile.mkdtemp(dir=render_dir))
+
+
+def wordcloud_text(fixtures):
+    cold_wordcloud_cache(fixtures.render_dir)
+    return fixtures.joined_text, "Word Cloud"
+
+
+def wordcloud_frequencies(fixtures):
+    cold_wordcloud_cache(fixtures.render_dir)
+    return fixtures.text_result.word_index.frequencies(2), "Positive Word Cloud"
+
+
+def per_row_sentiment(texts):
+    for text in texts:
+        analyze_sentiment(text)
+
+
+def is_numeric_column(series):
+    """Dashboard's ``utils.is_numeric_column``, which is this check on the shared column_types module."""
+    return infer_column_type(series) == NUMERIC
+
+
+BENCHMARKS = [
+    Benchmark('analyze_sentiment', lambda f: (f.texts.dropna().tolist(),), per_row_sentiment, max_rows=10_000),
+    Benchmark('analyze_text_column', lambda f: (f.texts,), analyze_text_column),
+    Benchmark('is_numeric_column[text]', lambda f: (f.texts,), is_numeric_column),
+    Benchmark('is_numeric_column[rating]', lambda f: (f.ratings,), is_numeric_column),
+    Benchmark('scale_numbers', lambda f: (f.ratings,), scale_numbers),
+    Benchmark('analyze_numeric_ratings', lambda f: (f.frame, RATING_COLUMN), analyze_numeric_ratings),
+    Benchmark('analyze_numeric_column', lambda f: (f.ratings, rating_scaler(RATING_COLUMN)), analyze_numeric_column),
+    Benchmark('chart:generate_pie_chart', lambda f: (f.text_result,), draw(generate_pie_chart)),
+    Benchmark('chart:generate_sentiment_pie_chart', lambda f: (f.numeric_result,), draw(generate_sentiment_pie_chart)),
+    Benchmark('chart:generate_scatter_plot', lambda f: (f.text_result,), draw(generate_scatter_plot)),
+    Benchmark('chart:generate_sentiment_scatter_plot', lambda f: (f.numeric_result,),
+              draw(generate_sentiment_scatter_plot)),
+    Benchmark('chart:generate_distribution_chart', lambda f: (f.text_result,), draw(generate_distribution_chart)),
+    Benchmark('chart:generate_bar_chart_text', lambda f: (f.text_result,), draw(generate_bar_chart_text)),
+    Benchmark('chart:generate_bar_chart_numeric', lambda f: (f.numeric_result,), draw(generate_bar_chart_numeric)),
+    Benchmark('chart:generate_wordcloud', wordcloud_text, draw(generate_wordcloud), max_rows=100_000),
+    Benchmark('chart:generate_wordcloud_from_frequencies', wordcloud_frequencies,
+              draw(generate_wordcloud_from_frequencies)),
+    Benchmark('generate_predefined_summary_numeric', lambda f: (f.numeric_result,), generate_predefined_summary_numeric),
+    Benchmark('generate_predefined_summary_text', lambda f: (f.text_result,), generate_predefined_summary_text),
+]
+
+
+def timed(benchmark, fixtures, loops):
+    """Seconds per call, averaged over ``loops`` calls on the same prepared arguments."""
+    args = benchmark.prepare(fixtures)
+    start = time.perf_counter()
+    for _ in range(loops):
+        benchmark.run(*args)
+    return (time.perf_counter() - start) / loops
+
+
+def measure(benchmark, fixtures, repeat):
+    """``(best_seconds, peak_bytes)`` for one case on one set of fixtures."""
+    best = timed(benchmark, fixtures, 1)
+    # Like timeit, loop cases too fast for the clock until each timed run lasts MIN_TIMED_SECONDS.
+    loops = max(1, math.ceil(MIN_TIMED_SECONDS / max(best, 1e-9))) if best < MIN_TIMED_SECONDS else 1
+    for _ in range(repeat):
+        best = min(best, timed(benchmark, fixtures, loops))
+    args = benchmark.prepare(fixtures)
+    tracemalloc.start()
+    try:
+        benchmark.run(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def run_benchmarks(sizes, names=None, repeat=3, seed=SEED, out=sys.stdout):
+    """Run every case whose name contains one of ``names`` at each size; returns a list of result dicts."""
+    selected = [b for b in BENCHMARKS if not names or any(name in b.name for name in names)]
+    results = []
+    fixtures = {}
+    print(f"{'case':<44} {'rows':>9} {'best':>11} {'rows/s':>13} {'peak':>10}", file=out)
+    with tempfile.TemporaryDirectory(prefix='wlb-bench-') as render_dir:
+        for size in sizes:
+            for benchmark in selected:
+                n_rows = min(size, benchmark.max_rows or size)
+                if n_rows not in fixtures:
+                    fixtures[n_rows] = Fixtures(n_rows, seed, render_dir)
+                seconds, peak = measure(benchmark, fixtures[n_rows], repeat)
+                result = {'case': benchmark.name, 'size': size, 'rows': n_rows, 'seconds': seconds,
+                          'rows_per_second': n_rows / max(seconds, 1e-9), 'peak_bytes': peak}
+                results.append(result)
+                print(f"{benchmark.name:<44} {n_rows:>9,} {seconds * 1e3:>9.3f}ms {result['rows_per_second']:>13,.0f} "
+                      f"{peak / 2 ** 20:>7.1f}MiB", file=out)
+            # Only the largest fixtures stay alive; smaller capped ones are cheap to rebuild.
+            fixtures = {n: f for n, f in fixtures.items() if n == size}
+    # The cold caches pointed into render_dir, which is gone now.
+    wordcloud_cache._cache = None
+    return results
+
+
+def compare(results, baseline, max_slowdown, max_memory_growth, out=sys.stdout):
+    """Print the cases that regressed against ``baseline`` and return how many did."""
+    previous = {(r['case'], r['size']): r for r in baseline}
+    regressions = 0
+    for result in results:
+        before = previous.get((result['case'], result['size']))
+        if before is None:
+            continue
+        slowdown = before['rows_per_second'] / result['rows_per_second']
+        growth = result['peak_bytes'] / max(before['peak_bytes'], 1)
+        if slowdown > max_slowdown or growth > max_memory_growth:
+            regressions += 1
+            print(f"REGRESSION {result['case']} at {result['rows']:,} rows: "
+                  f"{slowdown:.2f}x slower, {growth:.2f}x the peak memory", file=out)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Row counts to run at.')
+    parser.add_argument('--only', nargs='+', metavar='NAME', help='Only cases whose name contains NAME.')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per case; the best is reported.')
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--json', metavar='PATH', help='Write the results here.')
+    parser.add_argument('--baseline', metavar='PATH', help='Results of an earlier --json run to compare against.')
+    parser.add_argument('--max-slowdown', type=float, default=1.3)
+    parser.add_argument('--max-memory-growth', type=float, default=1.3)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.only, args.repeat, args.seed)
+    if args.json:
+        with open(args.json, 'w') as handle:
+            json.dump(results, handle, indent=1)
+    if args.baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+        if compare(results, baseline, args.max_slowdown, args.max_memory_growth):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
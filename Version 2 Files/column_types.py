@@ -0,0 +1,71 @@
+import warnings
+import numpy as np
+import pandas as pd
+
+NUMERIC = 'numeric'
+PERCENT = 'percent'
+DATETIME = 'datetime'
+TEXT = 'text'
+
+# A column is numeric (or percent) when more than this share of its values parse.
+TYPE_THRESHOLD = 0.8
+SAMPLE_SIZE = 2000
+SAMPLE_BATCH = 250
+# Sampling stops early once every share is this many standard errors away from the threshold.
+DECISION_Z = 4.0
+
+
+def sample_positions(n, sample_size=SAMPLE_SIZE, seed=0):
+    """Sorted random row positions, without touching the rows themselves."""
+    if n <= sample_size:
+        return np.arange(n)
+    return np.sort(np.random.default_rng(seed).choice(n, size=sample_size, replace=False))
+
+
+def decided(hits, seen, threshold=TYPE_THRESHOLD):
+    """True once ``hits / seen`` is clearly on one side of ``threshold``."""
+    margin = DECISION_Z * np.sqrt(threshold * (1 - threshold) / seen)
+    return abs(hits / seen - threshold) > margin
+
+
+def looks_like_dates(values, threshold=TYPE_THRESHOLD):
+    """Most values contain a digit and parse as dates (plain words like 'May' do not count)."""
+    strings = values.dropna().astype(str)
+    if len(strings) == 0 or strings.str.contains(r'\d').mean() <= threshold:
+        return False
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        parsed = pd.to_datetime(strings, errors='coerce')
+    return parsed.notna().sum() / len(values) > threshold
+
+
+def infer_column_type(series, sample_size=SAMPLE_SIZE, threshold=TYPE_THRESHOLD, seed=0):
+    """Classify a column as NUMERIC, PERCENT, DATETIME or TEXT from a random sample of its values.
+
+    Uses the same rules as a full scan: percent when most values contain '%', numeric (or
+    percent) when most values parse as numbers, with missing values counting against. Rows
+    are checked in batches and sampling stops as soon as every share is clearly decided.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return DATETIME
+    positions = sample_positions(len(series), sample_size, seed)
+    if not len(positions):
+        return TEXT
+    sample = series.iloc[positions]
+    seen = percent_hits = numeric_hits = stripped_hits = 0
+    for start in range(0, len(sample), SAMPLE_BATCH):
+        batch = sample.iloc[start:start + SAMPLE_BATCH]
+        strings = batch.astype(str)
+        seen += len(batch)
+        percent_hits += int(strings.str.contains('%', regex=False).sum())
+        numeric_hits += int(pd.to_numeric(batch, errors='coerce').notna().sum())
+        stripped_hits += int(pd.to_numeric(strings.str.rstrip('%'), errors='coerce').notna().sum())
+        if all(decided(hits, seen, threshold) for hits in (percent_hits, numeric_hits, stripped_hits)):
+            break
+    if percent_hits / seen > threshold:
+        return PERCENT if stripped_hits / seen > threshold else TEXT
+    if numeric_hits / seen > threshold:
+        return NUMERIC
+    if looks_like_dates(sample.iloc[:seen], threshold):
+        return DATETIME
+    return TEXT
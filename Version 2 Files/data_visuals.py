@@ -1,9 +1,41 @@
+import numpy as np
+import pandas as pd
 import matplotlib.pyplot as plt
-from wordcloud import WordCloud
+from matplotlib.colors import to_rgb
+from matplotlib.patches import Patch
+from wordcloud_cache import get_wordcloud_cache
 
-def generate_pie_chart(df):
+# Above this many points the scatter plots are drawn as a binned density image instead, so the
+# render cost depends on the bin count rather than on the number of rows.
+DENSITY_THRESHOLD = 50_000
+DENSITY_BINS = (200, 200)
+SENTIMENT_COLORS = ["red", "gray", "green"]
+
+def plot_density(ax, x, y, codes, colors, x_range, y_range, bins=DENSITY_BINS):
+    """Draw points as a 2D-binned image on ``ax``, one colour channel per code.
+
+    Each bin is tinted by the mix of codes that fall in it and darkened by its log count.
+    """
+    palette = np.array([to_rgb(c) for c in colors])
+    counts = np.stack([np.histogram2d(y[codes == code], x[codes == code], bins=(bins[1], bins[0]),
+                                      range=(y_range, x_range))[0]
+                       for code in range(len(colors))])
+    total = counts.sum(axis=0)
+    mix = np.einsum('cyx,ck->yxk', counts, palette) / np.maximum(total, 1)[..., None]
+    intensity = (np.log1p(total) / np.log1p(max(total.max(), 1)))[..., None]
+    image = 1 - intensity * (1 - mix)
+    ax.imshow(image, origin='lower', aspect='auto', interpolation='nearest',
+              extent=(x_range[0], x_range[1], y_range[0], y_range[1]))
+
+def row_positions(index):
+    """Numeric y values for rows: the index itself when it is numeric, otherwise the row order."""
+    if pd.api.types.is_numeric_dtype(index):
+        return np.asarray(index, dtype=float)
+    return np.arange(len(index), dtype=float)
+
+def generate_pie_chart(result):
     """Generate a pie chart showing sentiment distribution (for text analysis)."""
-    counts = df['sentiment'].value_counts()
+    counts = result.value_counts()
     fig, ax = plt.subplots(figsize=(4, 4))
     ax.pie(counts, labels=counts.index, autopct='%1.1f%%', startangle=90)
     ax.set_title("Sentiment Distribution")
@@ -11,9 +43,9 @@ def generate_pie_chart(df):
     ha="center", fontsize=10)
     return fig
 
-def generate_sentiment_pie_chart(df):
+def generate_sentiment_pie_chart(result):
     """Generate a pie chart showing sentiment distribution based on numeric ratings."""
-    sentiment_counts = df['rating_sentiment'].value_counts()
+    sentiment_counts = result.value_counts()
     fig, ax = plt.subplots(figsize=(4, 4))
     ax.pie(sentiment_counts, labels=sentiment_counts.index, autopct='%1.1f%%', startangle=90)
     ax.set_title("Sentiment Distribution")
@@ -23,10 +55,17 @@ def generate_sentiment_pie_chart(df):
      ha="center", fontsize=10)
     return fig
 
-def generate_scatter_plot(df):
-    """Generate a scatter plot of polarity values (for text analysis) with axes switched."""
+def generate_scatter_plot(result, density_threshold=DENSITY_THRESHOLD):
+    """Generate a scatter plot of polarity values (for text analysis) with axes switched.
+
+    Above ``density_threshold`` points a density image is drawn instead.
+    """
     fig, ax = plt.subplots(figsize=(6, 4))
-    ax.scatter(df['polarity'], range(len(df)), color='blue')
+    if result.total > density_threshold:
+        plot_density(ax, result.scores, np.arange(result.total, dtype=float), np.zeros(result.total, dtype=np.int8),
+                     ['blue'], (-1, 1), (0, result.total))
+    else:
+        ax.scatter(result.scores, range(result.total), color='blue')
     ax.set_title("Polarity Scatter Plot")
     ax.set_xlabel("Polarity")
     ax.set_ylabel("Data Inputs")
@@ -36,16 +75,24 @@ def generate_scatter_plot(df):
       ha="center", fontsize=10)
     return fig
 
-def generate_sentiment_scatter_plot(df):
+def generate_sentiment_scatter_plot(result, density_threshold=DENSITY_THRESHOLD):
     """Generate a scatter plot for numeric ratings
        x-axis: rating (1-5), y-axis: Inputs, colored by sentiment.
+       Above ``density_threshold`` points a density image with a colour per sentiment is drawn instead.
     """
-    colors = {"Negative": "red", "Neutral": "gray", "Positive": "green"}
-    df_filtered = df[df['numeric'].between(1, 5)]
+    colors = np.array(SENTIMENT_COLORS)
+    in_range = (result.scores >= 1) & (result.scores <= 5)
     fig, ax = plt.subplots(figsize=(6, 4))
-    x_values = df_filtered['numeric']
-    y_values = df_filtered.index
-    ax.scatter(x_values, y_values, c=df_filtered['rating_sentiment'].map(colors), s=20)
+    x_values = result.scores[in_range]
+    y_values = result.index[in_range]
+    if in_range.sum() > density_threshold:
+        y_values = row_positions(y_values)
+        plot_density(ax, x_values, y_values, result.codes[in_range], SENTIMENT_COLORS,
+                     (0.5, 5.5), (y_values.min(), y_values.max() + 1))
+        ax.legend(handles=[Patch(color=c, label=label) for c, label in zip(SENTIMENT_COLORS, result.counts.index)],
+                  loc='upper right', fontsize=8)
+    else:
+        ax.scatter(x_values, y_values, c=colors[result.codes[in_range]], s=20)
     ax.set_title("Scores Scatter Plot")
     ax.set_xlabel("Score")
     ax.set_ylabel("Data Inputs")
@@ -60,7 +107,10 @@ def generate_wordcloud(text, title):
     """Generate a word cloud figure from the provided text."""
     if not text.strip():
         text = "No data available."
-    wordcloud = WordCloud(width=800, height=400, background_color='white').generate(text)
+    # WordCloud.generate is process_text followed by generate_from_frequencies; the frequencies key the render cache.
+    from wordcloud import WordCloud
+    frequencies = WordCloud().process_text(text)
+    wordcloud = get_wordcloud_cache().render(frequencies, 800, 400, 'white', title)
     fig, ax = plt.subplots(figsize=(8, 4))
     ax.imshow(wordcloud, interpolation='bilinear')
     ax.axis('off')
@@ -70,9 +120,44 @@ def generate_wordcloud(text, title):
     ha="center", fontsize=10)
     return fig
 
-def generate_bar_chart_text(df):
+def generate_wordcloud_from_frequencies(frequencies, title):
+    """Generate a word cloud figure from a token -> count mapping."""
+    if not frequencies:
+        frequencies = {"No data available.": 1}
+    wordcloud = get_wordcloud_cache().render(frequencies, 800, 400, 'white', title)
+    fig, ax = plt.subplots(figsize=(8, 4))
+    ax.imshow(wordcloud, interpolation='bilinear')
+    ax.axis('off')
+    ax.set_title(title)
+    fig.text(0.5, 0.01,
+    "Caption: The word cloud visualizes the most frequent words from the text, with larger words representing higher frequencies.",
+    ha="center", fontsize=10)
+    return fig
+
+def generate_distribution_chart(result):
+    """Generate a histogram of polarity (text) or ratings (numeric) from the result's precomputed bins.
+
+    Used in place of the scatter plots when only aggregates are available (streaming mode).
+    """
+    counts, edges = result.histogram
+    fig, ax = plt.subplots(figsize=(6, 4))
+    ax.stairs(counts, edges, fill=True, color='blue')
+    if result.kind == 'text':
+        ax.set_title("Polarity Distribution")
+        ax.set_xlabel("Polarity")
+    else:
+        ax.set_title("Scores Distribution")
+        ax.set_xlabel("Score")
+    ax.set_ylabel("Data Inputs")
+    fig.subplots_adjust(bottom=0.25)
+    fig.text(0.5, 0.05,
+    "Caption: This histogram shows how many inputs fall into each score range.",
+    ha="center", fontsize=10)
+    return fig
+
+def generate_bar_chart_text(result):
     """Generate a bar chart showing sentiment distribution for text analysis."""
-    counts = df['sentiment'].value_counts()
+    counts = result.value_counts()
     color_mapping = {"Positive": "green", "Neutral": "yellow", "Negative": "red"}
     colors = [color_mapping.get(sentiment, "blue") for sentiment in counts.index]
     fig, ax = plt.subplots(figsize=(6, 4))
@@ -86,9 +171,9 @@ def generate_bar_chart_text(df):
     ha="center", fontsize=10)
     return fig
 
-def generate_bar_chart_numeric(df):
+def generate_bar_chart_numeric(result):
     """Generate a bar chart showing sentiment distribution based on numeric ratings."""
-    counts = df['rating_sentiment'].value_counts()
+    counts = result.value_counts()
     color_mapping = {"Positive": "green", "Neutral": "yellow", "Negative": "red"}
     colors = [color_mapping.get(sentiment, "blue") for sentiment in counts.index]
     fig, ax = plt.subplots(figsize=(6, 4))
@@ -1,12 +1,27 @@
+import os
+import sys
+import time
+STARTUP_T0 = time.perf_counter()
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from matplotlib import pyplot as plt
 import pandas as pd
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from analysis_function import (analyze_sentiment, analyze_numeric_ratings,
-                               generate_predefined_summary_numeric, generate_predefined_summary_text, scale_numbers)
+from analysis_function import (analyze_text_column, analyze_numeric_column, rating_scaler, analyze_numeric_ratings,
+                               to_numeric_values,
+                               generate_predefined_summary_numeric, generate_predefined_summary_text)
+from parallel_scoring import DEFAULT_CHUNK_SIZE
+from sentiment_backends import backend_choices, open_score_cache
+from streaming_analysis import analyze_csv_streaming, DEFAULT_STREAM_CHUNK_ROWS
+from analysis_worker import AnalysisWorker
+from column_types import infer_column_type, NUMERIC, PERCENT
+from diagnostics import Tracer
+from result_store import ResultStore
 from data_visuals import (generate_pie_chart, generate_sentiment_pie_chart, generate_scatter_plot,
-                          generate_sentiment_scatter_plot, generate_wordcloud,generate_bar_chart_text, generate_bar_chart_numeric)
+                          generate_sentiment_scatter_plot, generate_bar_chart_text, generate_bar_chart_numeric,
+                          generate_wordcloud_from_frequencies, generate_distribution_chart)
+
+PROGRESS_POLL_MS = 100
 
 class SentimentApp(tk.Tk):
     def __init__(self):
@@ -14,7 +29,21 @@ class SentimentApp(tk.Tk):
         self.title("Sentiment Analysis App")
         self.geometry("900x700")
         self.data = None
+        self.stream_path = None
+        self.result = None
+        # Per-row results for the loaded data, held outside it so analysis never adds frame columns.
+        self.results = ResultStore()
+        # One score cache per backend, opened on first use; score_cache is the one the last run used.
+        self.score_caches = {}
+        self.score_cache = None
         self.word_cloud_message = None
+        self.worker = None
+        self.pending_charts = {}
+        self.column_types = {}
+        # Timing spans for the Diagnostics tab; off unless WLB_TRACE is set or the box is ticked.
+        self.tracer = Tracer()
+        self.diagnostics_frame = None
+        self.diagnostics_text = None
         self.create_control_panel()
     
     def create_control_panel(self):
@@ -28,6 +57,8 @@ class SentimentApp(tk.Tk):
         tk.Radiobutton(frame, text="Manual Input", variable=self.data_source_var, value="manual").grid(row=0, column=3, padx=5)
         
         ttk.Button(frame, text="Load Data", command=self.load_data).grid(row=1, column=0, pady=5, sticky="w")
+        self.stream_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(frame, text="Stream large CSV in chunks", variable=self.stream_var).grid(row=1, column=1, columnspan=3, sticky="w", padx=5)
         tk.Label(frame, text="Manual Input (one entry per line):").grid(row=2, column=0, columnspan=4, sticky="w")
         self.manual_text = tk.Text(frame, height=5, width=60)
         self.manual_text.grid(row=3, column=0, columnspan=4, pady=5)
@@ -41,13 +72,42 @@ class SentimentApp(tk.Tk):
         self.column_combobox = ttk.Combobox(frame, state="readonly")
         self.column_combobox.grid(row=4, column=1, columnspan=3, sticky="we", padx=5)
         
+        tk.Label(frame, text="Parallel Workers (0 = all CPUs):").grid(row=5, column=0, sticky="w")
+        self.workers_var = tk.IntVar(value=1)
+        ttk.Spinbox(frame, from_=0, to=64, textvariable=self.workers_var, width=5).grid(row=5, column=1, sticky="w", padx=5)
+        tk.Label(frame, text="Chunk Size:").grid(row=5, column=2, sticky="w")
+        self.chunk_size_var = tk.IntVar(value=DEFAULT_CHUNK_SIZE)
+        ttk.Spinbox(frame, from_=500, to=100000, increment=500, textvariable=self.chunk_size_var, width=8).grid(row=5, column=3, sticky="w", padx=5)
+        self.use_cache_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(frame, text="Reuse scores from previous runs", variable=self.use_cache_var).grid(row=6, column=0, sticky="w")
+        self.status_label = tk.Label(frame, text="")
+        self.status_label.grid(row=6, column=1, columnspan=3, sticky="w", padx=5)
+        tk.Label(frame, text="Text Scorer:").grid(row=7, column=0, sticky="w")
+        self.backend_combobox = ttk.Combobox(frame, state="readonly", values=list(backend_choices().values()))
+        self.backend_combobox.current(0)
+        self.backend_combobox.grid(row=7, column=1, columnspan=2, sticky="w", padx=5)
+        self.trace_var = tk.BooleanVar(value=self.tracer.enabled)
+        tk.Checkbutton(frame, text="Record timings", variable=self.trace_var,
+                       command=self.toggle_tracing).grid(row=7, column=3, sticky="w")
+        
         self.analyze_btn = ttk.Button(frame, text="Analyze", command=self.perform_analysis)
-        self.analyze_btn.grid(row=5, column=0, columnspan=4, pady=10)
+        self.analyze_btn.grid(row=8, column=0, columnspan=4, pady=10)
+        self.progress_bar = ttk.Progressbar(frame, mode="determinate", maximum=100)
+        self.progress_bar.grid(row=9, column=0, sticky="we", padx=5)
+        self.progress_label = tk.Label(frame, text="")
+        self.progress_label.grid(row=9, column=1, columnspan=2, sticky="w", padx=5)
+        self.cancel_btn = ttk.Button(frame, text="Cancel", command=self.cancel_analysis, state="disabled")
+        self.cancel_btn.grid(row=9, column=3, sticky="e", padx=5)
         
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(fill='both', expand=True, padx=10, pady=10)
+        self.notebook.bind("<<NotebookTabChanged>>", self.render_selected_tab)
     
     def load_data(self):
+        if self.worker is not None:
+            messagebox.showinfo("Busy", "Wait for the running analysis to finish or cancel it first.")
+            return
+        self.column_types = {}
         src = self.data_source_var.get()
         if src == "pre":
             sample_data = {
@@ -63,13 +123,23 @@ class SentimentApp(tk.Tk):
                 ],
                 'work_life_balance': [4, 2, 5, 1, 2, 1, 3, 2]
             }
-            self.data = pd.DataFrame(sample_data)
+            with self.tracer.span('load_data', source=src):
+                self.data = pd.DataFrame(sample_data)
+            self.stream_path = None
             messagebox.showinfo("Info", "Pre-imported sample data loaded.")
         elif src == "csv":
             file = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
             if file:
                 try:
-                    self.data = pd.read_csv(file)
+                    if self.stream_var.get():
+                        # Only the header is read now; rows are streamed during analysis.
+                        self.data = pd.read_csv(file, nrows=0)
+                        self.stream_path = file
+                    else:
+                        with self.tracer.span('load_data', source=src, path=file):
+                            self.data = pd.read_csv(file)
+                        self.tracer.count('rows_loaded', len(self.data))
+                        self.stream_path = None
                     messagebox.showinfo("Info", f"CSV data loaded from {file}.")
                 except Exception as e:
                     messagebox.showerror("Error", f"Failed to load CSV: {e}")
@@ -78,13 +148,32 @@ class SentimentApp(tk.Tk):
             text_input = self.manual_text.get("1.0", "end-1c").strip()
             if text_input:
                 lines = text_input.splitlines()
-                self.data = pd.DataFrame({"text": lines})
+                with self.tracer.span('load_data', source=src):
+                    self.data = pd.DataFrame({"text": lines})
+                self.stream_path = None
                 messagebox.showinfo("Info", "Manual input data loaded.")
             else:
                 messagebox.showwarning("Warning", "No manual input provided.")
                 return
+        self.results = ResultStore(self.data)
         self.update_column_options()
     
+    def get_column_type(self, column):
+        """Sampled type of a column of the loaded data, inferred once per dataset and column."""
+        if column not in self.column_types:
+            with self.tracer.span('infer_column_type', column=column):
+                self.column_types[column] = infer_column_type(self.data[column])
+        return self.column_types[column]
+    
+    def get_score_cache(self, backend):
+        """Open the persistent score cache for ``backend`` on first use, or return None when it is
+        switched off or the backend is faster than a cache lookup."""
+        if not self.use_cache_var.get():
+            return None
+        if backend not in self.score_caches:
+            self.score_caches[backend] = open_score_cache(backend)
+        return self.score_caches[backend]
+    
     def update_column_options(self):
         if self.data is not None:
             cols = list(self.data.columns)
@@ -97,105 +186,157 @@ class SentimentApp(tk.Tk):
         if not selected_col or selected_col not in self.data.columns:
             messagebox.showerror("Error", "Selected column not found.")
             return
-        
-        col_series = self.data[selected_col].astype(str)
-        #more than 80% of values are percents
-        is_percent = col_series.str.contains('%').mean() > 0.8
+        if self.worker is not None:
+            return
+        # Tk variables and the cache are read here, on the main thread; the task only gets plain values.
+        stream_path = self.stream_path
+        series = None if stream_path else self.data[selected_col]
+        # Decided from a sample of the column; a streamed CSV is typed from its first chunk instead.
+        column_type = None if stream_path else self.get_column_type(selected_col)
+        workers = self.workers_var.get()
+        chunk_size = self.chunk_size_var.get()
+        backend = list(backend_choices())[self.backend_combobox.current()]
+        cache = self.score_cache = self.get_score_cache(backend)
+        tracer = self.tracer
 
-        #checks if value is percent. converts to float if true
-        if is_percent:
-            numeric_vals = col_series.str.rstrip('%').astype(float) / 100.0
-        else:
-            numeric_vals = pd.to_numeric(self.data[selected_col], errors='coerce')
+        def analyze(progress):
+            if stream_path:
+                return analyze_csv_streaming(stream_path, selected_col, DEFAULT_STREAM_CHUNK_ROWS,
+                                             workers, chunk_size, cache, progress,
+                                             rating_scaler(selected_col), backend, tracer)
+            if column_type in (NUMERIC, PERCENT):
+                #converts percents to fractions, then scales data between -1,1 and labels each rating once
+                numeric_vals = to_numeric_values(series, column_type == PERCENT)
+                return analyze_numeric_column(numeric_vals, rating_scaler(selected_col))
+            return analyze_text_column(series, workers, chunk_size, cache, progress, backend, tracer)
 
-        numeric_ratio = numeric_vals.notnull().mean()
-        
-        if numeric_ratio > 0.8:
-            self.data['numeric'] = numeric_vals
-            #scales data between -1,1
-            self.data['scaled'] = scale_numbers(numeric_vals)
-            self.data['rating_sentiment'] = self.data['scaled'].apply(
-                lambda x: "Negative" if x <= -0.1 else "Neutral" if x <= 0.1 else "Positive"
-            )
-            
-            fig_pie = generate_sentiment_pie_chart(self.data)
-            fig_scatter = generate_sentiment_scatter_plot(self.data)
-            fig_bar = generate_bar_chart_numeric(self.data)
+        def task(progress):
+            hits, misses = (cache.hits, cache.misses) if cache is not None else (0, 0)
+            with tracer.span('analyze', column=selected_col, backend=backend, streamed=bool(stream_path)):
+                result = analyze(progress)
+            if cache is not None:
+                tracer.count('cache_hits', cache.hits - hits)
+                tracer.count('cache_misses', cache.misses - misses)
+            return result
+
+        self.worker = AnalysisWorker(task)
+        self.analyze_btn.config(state="disabled")
+        self.cancel_btn.config(state="normal")
+        self.progress_bar['value'] = 0
+        self.progress_label.config(text="Starting...")
+        self.worker.start()
+        self.after(PROGRESS_POLL_MS, self.poll_analysis, selected_col, bool(stream_path))
+    
+    def cancel_analysis(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.progress_label.config(text="Cancelling...")
+    
+    def poll_analysis(self, selected_col, streaming):
+        """Apply queued progress from the worker thread; build the figures once it has finished."""
+        for kind, payload in self.worker.poll():
+            if kind == 'progress':
+                fraction, rows = payload
+                rate, eta = self.worker.rate(fraction, rows)
+                self.progress_bar['value'] = 100 * fraction
+                eta_text = f", ETA {eta:.0f}s" if eta is not None else ""
+                self.progress_label.config(text=f"{fraction:.0%} - {rows:,} rows at {rate:,.0f} rows/s{eta_text}")
+                continue
+            self.worker = None
+            self.analyze_btn.config(state="normal")
+            self.cancel_btn.config(state="disabled")
+            if kind == 'done':
+                self.progress_bar['value'] = 100
+                self.progress_label.config(text="Done")
+                if streaming:
+                    self.show_streaming_results(payload)
+                else:
+                    self.show_results(selected_col, payload)
+            elif kind == 'cancelled':
+                self.progress_label.config(text="Cancelled")
+            else:
+                self.progress_label.config(text="Failed")
+                messagebox.showerror("Error", f"Analysis failed: {payload}")
+            return
+        self.after(PROGRESS_POLL_MS, self.poll_analysis, selected_col, streaming)
+    
+    def show_results(self, selected_col, result):
+        self.results.add(selected_col, result)
+        if result.kind == 'numeric':
+            charts = [("Pie Chart", lambda: generate_sentiment_pie_chart(result)),
+                      ("Scatter Plot", lambda: generate_sentiment_scatter_plot(result)),
+                      ("Bar Chart", lambda: generate_bar_chart_numeric(result))]
             self.word_cloud_message = "Data analyzed was numerical, so no word cloud was generated."
-            
-            sentiment_counts = self.data['rating_sentiment'].value_counts()
-            total = sentiment_counts.sum()
-            positive_pct = (sentiment_counts.get("Positive", 0) / total) * 100
-            neutral_pct = (sentiment_counts.get("Neutral", 0) / total) * 100
-            negative_pct = (sentiment_counts.get("Negative", 0) / total) * 100
-            avg_rating = self.data['numeric'].mean()
-            summary = generate_predefined_summary_numeric(positive_pct, neutral_pct, negative_pct, avg_rating)
+            with self.tracer.span('generate_predefined_summary_numeric'):
+                summary = generate_predefined_summary_numeric(result)
         else:
-            self.data['sentiment'], self.data['polarity'] = zip(*self.data[selected_col].apply(analyze_sentiment))
-            fig_pie = generate_pie_chart(self.data)
-            fig_scatter = generate_scatter_plot(self.data)
-            fig_bar = generate_bar_chart_text(self.data)
-            pos_text = ' '.join(self.data[self.data['sentiment'] == 'Positive'][selected_col].dropna().astype(str))
-            neg_text = ' '.join(self.data[self.data['sentiment'] == 'Negative'][selected_col].dropna().astype(str))
-            self.fig_pos_wc = generate_wordcloud(pos_text, "Positive Word Cloud")
-            self.fig_neg_wc = generate_wordcloud(neg_text, "Negative Word Cloud")
+            status = f"Scored {result.unique_count} unique of {result.total} texts ({result.dedup_ratio:.0%} duplicates)"
+            if self.score_cache is not None:
+                stats = self.score_cache.stats()
+                status += f"; score cache: {stats['hits']} hits, {stats['misses']} misses"
+            self.status_label.config(text=status)
+            charts = [("Pie Chart", lambda: generate_pie_chart(result)),
+                      ("Scatter Plot", lambda: generate_scatter_plot(result)),
+                      ("Bar Chart", lambda: generate_bar_chart_text(result)),
+                      ("Positive Word Cloud", lambda: generate_wordcloud_from_frequencies(result.word_index.frequencies(2), "Positive Word Cloud")),
+                      ("Negative Word Cloud", lambda: generate_wordcloud_from_frequencies(result.word_index.frequencies(0), "Negative Word Cloud"))]
             self.word_cloud_message = None
-            sentiment_counts = self.data['sentiment'].value_counts().to_dict()
-            avg_polarity = self.data['polarity'].mean()
-            summary = generate_predefined_summary_text(sentiment_counts, avg_polarity)
+            with self.tracer.span('generate_predefined_summary_text'):
+                summary = generate_predefined_summary_text(result)
         
-        self.display_results(fig_pie, fig_scatter, fig_bar, summary)
+        self.result = result
+        self.display_results(charts, summary)
     
-    def display_results(self, fig_pie, fig_scatter, fig_bar,summary):
-        for child in self.notebook.winfo_children():
-            child.destroy()
-        
-        # Pie Chart Tab.
-        frame_pie = ttk.Frame(self.notebook)
-        self.notebook.add(frame_pie, text="Pie Chart")
-        canvas1 = FigureCanvasTkAgg(fig_pie, master=frame_pie)
-        canvas1.draw()
-        canvas1.get_tk_widget().pack(fill='both', expand=True)
-        plt.close(fig_pie)
-        
-        # Scatter Plot Tab.
-        frame_scatter = ttk.Frame(self.notebook)
-        self.notebook.add(frame_scatter, text="Scatter Plot")
-        canvas2 = FigureCanvasTkAgg(fig_scatter, master=frame_scatter)
-        canvas2.draw()
-        canvas2.get_tk_widget().pack(fill='both', expand=True)
-        plt.close(fig_scatter)
-
+    def show_streaming_results(self, stream):
+        """Chart a CSV that was analyzed chunk by chunk, keeping only running aggregates in memory."""
+        result = stream.result()
+        if result.kind == 'numeric':
+            charts = [("Pie Chart", lambda: generate_sentiment_pie_chart(result)),
+                      ("Scatter Plot", lambda: generate_distribution_chart(result)),
+                      ("Bar Chart", lambda: generate_bar_chart_numeric(result))]
+            self.word_cloud_message = "Data analyzed was numerical, so no word cloud was generated."
+            with self.tracer.span('generate_predefined_summary_numeric'):
+                summary = generate_predefined_summary_numeric(result)
+        else:
+            charts = [("Pie Chart", lambda: generate_pie_chart(result)),
+                      ("Scatter Plot", lambda: generate_distribution_chart(result)),
+                      ("Bar Chart", lambda: generate_bar_chart_text(result)),
+                      ("Positive Word Cloud", lambda: generate_wordcloud_from_frequencies(result.word_index.frequencies(2), "Positive Word Cloud")),
+                      ("Negative Word Cloud", lambda: generate_wordcloud_from_frequencies(result.word_index.frequencies(0), "Negative Word Cloud"))]
+            self.word_cloud_message = None
+            with self.tracer.span('generate_predefined_summary_text'):
+                summary = generate_predefined_summary_text(result)
+        self.status_label.config(text=f"Streamed {stream.rows} rows")
+        self.result = result
+        self.display_results(charts, summary)
+    
+    def display_results(self, charts, summary):
+        """Add a placeholder tab per chart; each figure is only built the first time its tab is shown.
 
+        ``charts`` is a list of ``(tab title, build_figure)`` pairs.
+        """
+        with self.tracer.span('display_results', charts=len(charts)):
+            self.add_result_tabs(charts, summary)
+            self.notebook.select(0)
+            self.render_selected_tab()
 
-         # Bar Chart Tab.
-        frame_bar = ttk.Frame(self.notebook)
-        self.notebook.add(frame_bar, text="Bar Chart")
-        canvas_bar = FigureCanvasTkAgg(fig_bar, master=frame_bar)
-        canvas_bar.draw()
-        canvas_bar.get_tk_widget().pack(fill='both', expand=True)
-        plt.close(fig_bar)
+    def add_result_tabs(self, charts, summary):
+        for child in self.notebook.winfo_children():
+            child.destroy()
+        self.pending_charts = {}
         
+        for title, build_figure in charts:
+            frame = ttk.Frame(self.notebook)
+            self.notebook.add(frame, text=title)
+            placeholder = tk.Label(frame, text="Rendering...", font=("Arial", 14))
+            placeholder.pack(expand=True, fill='both')
+            self.pending_charts[str(frame)] = (title, build_figure, placeholder)
         
-        # Word Cloud Tab(s) or Message.
+        # Word Cloud Message.
         if self.word_cloud_message:
             frame_wc = ttk.Frame(self.notebook)
             self.notebook.add(frame_wc, text="Word Cloud")
             tk.Label(frame_wc, text=self.word_cloud_message, font=("Arial", 14)).pack(expand=True, fill='both', padx=10, pady=10)
-        else:
-            frame_pos = ttk.Frame(self.notebook)
-            self.notebook.add(frame_pos, text="Positive Word Cloud")
-            canvas_pos = FigureCanvasTkAgg(self.fig_pos_wc, master=frame_pos)
-            canvas_pos.draw()
-            canvas_pos.get_tk_widget().pack(fill='both', expand=True)
-            plt.close(self.fig_pos_wc)
-            
-            frame_neg = ttk.Frame(self.notebook)
-            self.notebook.add(frame_neg, text="Negative Word Cloud")
-            canvas_neg = FigureCanvasTkAgg(self.fig_neg_wc, master=frame_neg)
-            canvas_neg.draw()
-            canvas_neg.get_tk_widget().pack(fill='both', expand=True)
-            plt.close(self.fig_neg_wc)
         
         # Summary Tab.
         frame_sum = ttk.Frame(self.notebook)
@@ -204,6 +345,57 @@ class SentimentApp(tk.Tk):
         text_widget.insert(tk.END, summary)
         text_widget.config(state="disabled")
         text_widget.pack(fill='both', expand=True)
+        self.add_diagnostics_tab()
+    
+    def add_diagnostics_tab(self):
+        """Per-phase timings and counters recorded so far, refreshed whenever the tab is shown."""
+        self.diagnostics_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.diagnostics_frame, text="Diagnostics")
+        buttons = ttk.Frame(self.diagnostics_frame)
+        buttons.pack(fill='x', pady=5)
+        ttk.Button(buttons, text="Export Chrome Trace...", command=self.export_trace).pack(side='left', padx=5)
+        ttk.Button(buttons, text="Clear", command=self.clear_trace).pack(side='left', padx=5)
+        self.diagnostics_text = tk.Text(self.diagnostics_frame, wrap='none', font=("Courier", 11))
+        self.diagnostics_text.pack(fill='both', expand=True)
+    
+    def refresh_diagnostics(self):
+        self.diagnostics_text.config(state="normal")
+        self.diagnostics_text.delete("1.0", tk.END)
+        self.diagnostics_text.insert(tk.END, self.tracer.report() + "\n\n" + self.results.memory_report())
+        self.diagnostics_text.config(state="disabled")
+    
+    def toggle_tracing(self):
+        self.tracer.enabled = self.trace_var.get()
+    
+    def export_trace(self):
+        path = filedialog.asksaveasfilename(defaultextension=".json", initialfile="wlb-trace.json",
+                                            filetypes=[("Chrome trace", "*.json")])
+        if path:
+            self.tracer.export(path)
+            messagebox.showinfo("Info", f"Trace written to {path}; open it in chrome://tracing or ui.perfetto.dev.")
+    
+    def clear_trace(self):
+        self.tracer.clear()
+        self.refresh_diagnostics()
+    
+    def render_selected_tab(self, event=None):
+        """Build and draw the selected tab's figure if it has not been drawn yet."""
+        selected = self.notebook.select()
+        if self.diagnostics_frame is not None and selected == str(self.diagnostics_frame):
+            self.refresh_diagnostics()
+            return
+        pending = self.pending_charts.pop(selected, None)
+        if pending is None:
+            return
+        title, build_figure, placeholder = pending
+        with self.tracer.span(f'generate_figure: {title}'):
+            fig = build_figure()
+        placeholder.destroy()
+        with self.tracer.span(f'draw_canvas: {title}'):
+            canvas = FigureCanvasTkAgg(fig, master=self.nametowidget(selected))
+            canvas.draw()
+            canvas.get_tk_widget().pack(fill='both', expand=True)
+        plt.close(fig)
 
     def add_placeholder(self, manual_text, placeholder_text):
         manual_text.insert("1.0", placeholder_text)
@@ -222,4 +414,6 @@ class SentimentApp(tk.Tk):
 
 if __name__ == "__main__":
     app = SentimentApp()
+    if os.environ.get("WLB_STARTUP_REPORT"):
+        app.after_idle(lambda: print(f"window ready {time.perf_counter() - STARTUP_T0:.2f}s after startup", file=sys.stderr))
     app.mainloop()
@@ -0,0 +1,108 @@
+import hashlib
+import os
+import sqlite3
+import time
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".wlb_cache", "polarity.sqlite")
+DEFAULT_MAX_ENTRIES = 2_000_000
+# SQLite limits the number of bound parameters per statement.
+_BATCH = 900
+
+
+def normalize_text(text):
+    """Collapse whitespace so trivially different copies of a review share a cache entry."""
+    return " ".join(str(text).split())
+
+
+class PolarityCache:
+    """On-disk score cache shared across runs and frontends.
+
+    Entries are keyed by a hash of the normalized text together with the analyzer name and
+    version, so upgrading an analyzer never serves stale scores. The table is capped at
+    ``max_entries`` rows; the least recently used rows are evicted first.
+    """
+
+    def __init__(self, analyzer, version, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.analyzer = analyzer
+        self.version = str(version)
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS scores "
+                          "(key BLOB PRIMARY KEY, score REAL NOT NULL, last_used INTEGER NOT NULL)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS scores_last_used ON scores (last_used)")
+        self.conn.commit()
+
+    def key(self, text):
+        raw = f"{self.analyzer}\0{self.version}\0{normalize_text(text)}".encode("utf-8")
+        return hashlib.blake2b(raw, digest_size=16).digest()
+
+    def get_many(self, texts):
+        """Return a list with the cached score for each text, or None where it is missing."""
+        keys = [self.key(text) for text in texts]
+        found = {}
+        now = time.time_ns()
+        for start in range(0, len(keys), _BATCH):
+            batch = keys[start:start + _BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.conn.execute(f"SELECT key, score FROM scores WHERE key IN ({placeholders})", batch)
+            hit_keys = []
+            for key, score in rows:
+                found[key] = score
+                hit_keys.append(key)
+            if hit_keys:
+                self.conn.execute(f"UPDATE scores SET last_used = ? WHERE key IN ({','.join('?' * len(hit_keys))})",
+                                  [now, *hit_keys])
+        self.conn.commit()
+        scores = [found.get(key) for key in keys]
+        hits = sum(score is not None for score in scores)
+        self.hits += hits
+        self.misses += len(scores) - hits
+        return scores
+
+    def put_many(self, texts, scores):
+        now = time.time_ns()
+        self.conn.executemany("INSERT OR REPLACE INTO scores (key, score, last_used) VALUES (?, ?, ?)",
+                              [(self.key(text), float(score), now) for text, score in zip(texts, scores)])
+        self.conn.commit()
+        self.evict()
+
+    def evict(self):
+        """Drop the least recently used entries beyond ``max_entries``."""
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM scores").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self.conn.execute("DELETE FROM scores WHERE key IN "
+                              "(SELECT key FROM scores ORDER BY last_used LIMIT ?)", (excess,))
+            self.conn.commit()
+
+    def score(self, texts, score_batch):
+        """Return scores for ``texts``, computing only the cache misses with ``score_batch``."""
+        texts = list(texts)
+        scores = self.get_many(texts)
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if missing:
+            computed = score_batch([texts[i] for i in missing])
+            self.put_many([texts[i] for i in missing], computed)
+            for i, score in zip(missing, computed):
+                scores[i] = float(score)
+        return scores
+
+    def stats(self):
+        (entries,) = self.conn.execute("SELECT COUNT(*) FROM scores").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': entries,
+        }
+
+    def close(self):
+        self.conn.close()
@@ -1,21 +1,28 @@
+import time
+STARTUP_T0 = time.perf_counter()
 import sys
 import os
+import multiprocessing
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import matplotlib
 matplotlib.use('TkAgg')
 from matplotlib import pyplot as plt
+import numpy as np
 import pandas as pd
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from wordcloud import WordCloud
-import nltk
-from nltk.corpus import stopwords
-from textblob import TextBlob
-from sklearn.preprocessing import MinMaxScaler
-
-# Ensure necessary NLTK data is available
-nltk.download('stopwords')
-nltk.download('punkt')
+from wordcloud_cache import get_wordcloud_cache
+from analysis_function import (analyze_text_column, analyze_numeric_column, rating_scaler,
+                               to_numeric_values)
+from parallel_scoring import DEFAULT_CHUNK_SIZE
+from sentiment_backends import backend_choices, open_score_cache
+from streaming_analysis import analyze_csv_streaming, DEFAULT_STREAM_CHUNK_ROWS
+from data_visuals import (generate_distribution_chart, plot_density, row_positions,
+                          DENSITY_THRESHOLD, SENTIMENT_COLORS)
+from analysis_worker import AnalysisWorker
+from column_types import infer_column_type, NUMERIC, PERCENT
+from diagnostics import Tracer
+from result_store import ResultStore
 
 # Helper to determine base path when frozen
 if getattr(sys, 'frozen', False):
@@ -23,42 +30,12 @@ if getattr(sys, 'frozen', False):
 else:
     BASE_PATH = os.path.dirname(__file__)
 
-# Analysis functions
-
-def analyze_sentiment(text):
-    """Analyze sentiment using TextBlob and return (sentiment, polarity)."""
-    polarity = TextBlob(str(text)).sentiment.polarity
-    if polarity > 0.1:
-        sentiment = 'Positive'
-    elif polarity < -0.1:
-        sentiment = 'Negative'
-    else:
-        sentiment = 'Neutral'
-    return sentiment, polarity
-
-
-def analyze_numeric_ratings(df, col):
-    """Calculate basic statistics and distribution for numeric data."""
-    results = {
-        'average': df[col].mean(),
-        'median': df[col].median(),
-        'min': df[col].min(),
-        'max': df[col].max(),
-        'distribution': df[col].value_counts().sort_index()
-    }
-    return results
-
 
-def scale_numbers(col):
-    scaler = MinMaxScaler(feature_range=(-1,1))
-    is_numeric = pd.api.types.is_numeric_dtype(col)
-    if is_numeric:
-        scaled = scaler.fit_transform(col.values.reshape(-1,1))
-        return pd.Series(scaled.flatten(), index=col.index)
-    return None
-
-
-def generate_predefined_summary_numeric(positive_pct, neutral_pct, negative_pct, average_rating):
+def generate_predefined_summary_numeric(result):
+    positive_pct = result.percentage('Positive')
+    neutral_pct = result.percentage('Neutral')
+    negative_pct = result.percentage('Negative')
+    average_rating = result.mean
     summary = "Work-Life Balance Analysis:\n"
     summary += f"- Positive Responses: {positive_pct:.1f}%\n"
     summary += f"- Neutral Responses: {neutral_pct:.1f}%\n"
@@ -111,18 +88,13 @@ def generate_predefined_summary_numeric(positive_pct, neutral_pct, negative_pct,
     return summary
 
 
-def generate_predefined_summary_text(sentiment_counts, avg_polarity):
+def generate_predefined_summary_text(result):
+    sentiment_counts = result.value_counts().to_dict()
+    avg_polarity = result.mean
     summary = "Work-Life Balance Analysis:\n"
     summary += f"- Sentiment Breakdown: {sentiment_counts}\n"
     summary += f"- Average Sentiment Polarity: {avg_polarity:.2f}\n\n"
-    positive = sentiment_counts.get('Positive', 0)
-    neutral = sentiment_counts.get('Neutral', 0)
-    negative = sentiment_counts.get('Negative', 0)
-    total = positive + neutral + negative
-    if total:
-        negative_pct = (negative / total) * 100
-    else:
-        negative_pct = 0
+    negative_pct = result.percentage('Negative')
     if avg_polarity >= 0.5:
         summary += (
             "Highly positive sentiment indicates employees feel very supported.\n\n"
@@ -159,8 +131,8 @@ def generate_predefined_summary_text(sentiment_counts, avg_polarity):
 
 # Visualization functions
 
-def generate_pie_chart(df):
-    counts = df['sentiment'].value_counts()
+def generate_pie_chart(result):
+    counts = result.value_counts()
     fig, ax = plt.subplots(figsize=(4,4))
     ax.pie(counts, labels=counts.index, autopct='%1.1f%%', startangle=90)
     ax.set_title("Sentiment Distribution")
@@ -168,8 +140,8 @@ def generate_pie_chart(df):
     return fig
 
 
-def generate_sentiment_pie_chart(df):
-    counts = df['rating_sentiment'].value_counts()
+def generate_sentiment_pie_chart(result):
+    counts = result.value_counts()
     fig, ax = plt.subplots(figsize=(4,4))
     ax.pie(counts, labels=counts.index, autopct='%1.1f%%', startangle=90)
     ax.set_title("Sentiment Distribution")
@@ -178,9 +150,13 @@ def generate_sentiment_pie_chart(df):
     return fig
 
 
-def generate_scatter_plot(df):
+def generate_scatter_plot(result):
     fig, ax = plt.subplots(figsize=(6,4))
-    ax.scatter(df['polarity'], range(len(df)))
+    if result.total > DENSITY_THRESHOLD:
+        plot_density(ax, result.scores, np.arange(result.total, dtype=float), np.zeros(result.total, dtype=np.int8),
+                     ['tab:blue'], (-1, 1), (0, result.total))
+    else:
+        ax.scatter(result.scores, range(result.total))
     ax.set_title("Polarity Scatter Plot")
     ax.set_xlabel("Polarity")
     ax.set_ylabel("Data Inputs")
@@ -189,10 +165,14 @@ def generate_scatter_plot(df):
     return fig
 
 
-def generate_sentiment_scatter_plot(df):
-    colors = df['rating_sentiment'].map({'Negative':'red','Neutral':'gray','Positive':'green'})
+def generate_sentiment_scatter_plot(result):
     fig, ax = plt.subplots(figsize=(6,4))
-    ax.scatter(df['numeric'], df.index, c=colors, s=20)
+    if result.total > DENSITY_THRESHOLD:
+        y = row_positions(result.index)
+        plot_density(ax, result.scores, y, result.codes, SENTIMENT_COLORS, (0.5, 5.5), (y.min(), y.max() + 1))
+    else:
+        colors = pd.Series(result.labels).map({'Negative':'red','Neutral':'gray','Positive':'green'})
+        ax.scatter(result.scores, result.index, c=colors, s=20)
     ax.set_title("Scores Scatter Plot")
     ax.set_xlabel("Score")
     ax.set_ylabel("Data Inputs")
@@ -202,10 +182,10 @@ def generate_sentiment_scatter_plot(df):
     return fig
 
 
-def generate_wordcloud(text, title):
-    if not text.strip():
-        text = "No data available."
-    wc = WordCloud(width=800, height=400, background_color='white').generate(text)
+def generate_wordcloud(frequencies, title):
+    if not frequencies:
+        frequencies = {"No data available.": 1}
+    wc = get_wordcloud_cache().render(frequencies, 800, 400, 'white', title)
     fig, ax = plt.subplots(figsize=(8,4))
     ax.imshow(wc, interpolation='bilinear')
     ax.axis('off')
@@ -214,8 +194,8 @@ def generate_wordcloud(text, title):
     return fig
 
 
-def generate_bar_chart_text(df):
-    counts = df['sentiment'].value_counts()
+def generate_bar_chart_text(result):
+    counts = result.value_counts()
     colors = [ 'green' if s=='Positive' else 'yellow' if s=='Neutral' else 'red' for s in counts.index ]
     fig, ax = plt.subplots(figsize=(6,4))
     ax.bar(counts.index, counts.values, color=colors)
@@ -227,8 +207,8 @@ def generate_bar_chart_text(df):
     return fig
 
 
-def generate_bar_chart_numeric(df):
-    counts = df['rating_sentiment'].value_counts()
+def generate_bar_chart_numeric(result):
+    counts = result.value_counts()
     colors = [ 'green' if s=='Positive' else 'yellow' if s=='Neutral' else 'red' for s in counts.index ]
     fig, ax = plt.subplots(figsize=(6,4))
     ax.bar(counts.index, counts.values, color=colors)
@@ -240,13 +220,29 @@ def generate_bar_chart_numeric(df):
     return fig
 
 # Main Application
+PROGRESS_POLL_MS = 100
+
 class SentimentApp(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("Sentiment Analysis App")
         self.geometry("900x700")
         self.data = None
+        self.stream_path = None
+        self.result = None
+        # Per-row results for the loaded data, held outside it so analysis never adds frame columns.
+        self.results = ResultStore()
+        # One score cache per backend, opened on first use; score_cache is the one the last run used.
+        self.score_caches = {}
+        self.score_cache = None
         self.word_cloud_message = None
+        self.worker = None
+        self.pending_charts = {}
+        self.column_types = {}
+        # Timing spans for the Diagnostics tab; off unless WLB_TRACE is set or the box is ticked.
+        self.tracer = Tracer()
+        self.diagnostics_frame = None
+        self.diagnostics_text = None
         self.create_control_panel()
 
     def create_control_panel(self):
@@ -258,6 +254,8 @@ class SentimentApp(tk.Tk):
         tk.Radiobutton(frame, text="CSV File", variable=self.data_source_var, value="csv").grid(row=0, column=2, padx=5)
         tk.Radiobutton(frame, text="Manual Input", variable=self.data_source_var, value="manual").grid(row=0, column=3, padx=5)
         ttk.Button(frame, text="Load Data", command=self.load_data).grid(row=1, column=0, pady=5, sticky="w")
+        self.stream_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(frame, text="Stream large CSV in chunks", variable=self.stream_var).grid(row=1, column=1, columnspan=3, sticky="w", padx=5)
         tk.Label(frame, text="Manual Input (one entry per line):").grid(row=2, column=0, columnspan=4, sticky="w")
         self.manual_text = tk.Text(frame, height=5, width=60)
         self.manual_text.grid(row=3, column=0, columnspan=4, pady=5)
@@ -268,24 +266,62 @@ class SentimentApp(tk.Tk):
         tk.Label(frame, text="Select Column for Analysis:").grid(row=4, column=0, sticky="w")
         self.column_combobox = ttk.Combobox(frame, state="readonly")
         self.column_combobox.grid(row=4, column=1, columnspan=3, sticky="we", padx=5)
+        tk.Label(frame, text="Parallel Workers (0 = all CPUs):").grid(row=5, column=0, sticky="w")
+        self.workers_var = tk.IntVar(value=1)
+        ttk.Spinbox(frame, from_=0, to=64, textvariable=self.workers_var, width=5).grid(row=5, column=1, sticky="w", padx=5)
+        tk.Label(frame, text="Chunk Size:").grid(row=5, column=2, sticky="w")
+        self.chunk_size_var = tk.IntVar(value=DEFAULT_CHUNK_SIZE)
+        ttk.Spinbox(frame, from_=500, to=100000, increment=500, textvariable=self.chunk_size_var, width=8).grid(row=5, column=3, sticky="w", padx=5)
+        self.use_cache_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(frame, text="Reuse scores from previous runs", variable=self.use_cache_var).grid(row=6, column=0, sticky="w")
+        self.status_label = tk.Label(frame, text="")
+        self.status_label.grid(row=6, column=1, columnspan=3, sticky="w", padx=5)
+        tk.Label(frame, text="Text Scorer:").grid(row=7, column=0, sticky="w")
+        self.backend_combobox = ttk.Combobox(frame, state="readonly", values=list(backend_choices().values()))
+        self.backend_combobox.current(0)
+        self.backend_combobox.grid(row=7, column=1, columnspan=2, sticky="w", padx=5)
+        self.trace_var = tk.BooleanVar(value=self.tracer.enabled)
+        tk.Checkbutton(frame, text="Record timings", variable=self.trace_var,
+                       command=self.toggle_tracing).grid(row=7, column=3, sticky="w")
         self.analyze_btn = ttk.Button(frame, text="Analyze", command=self.perform_analysis)
-        self.analyze_btn.grid(row=5, column=0, columnspan=4, pady=10)
+        self.analyze_btn.grid(row=8, column=0, columnspan=4, pady=10)
+        self.progress_bar = ttk.Progressbar(frame, mode="determinate", maximum=100)
+        self.progress_bar.grid(row=9, column=0, sticky="we", padx=5)
+        self.progress_label = tk.Label(frame, text="")
+        self.progress_label.grid(row=9, column=1, columnspan=2, sticky="w", padx=5)
+        self.cancel_btn = ttk.Button(frame, text="Cancel", command=self.cancel_analysis, state="disabled")
+        self.cancel_btn.grid(row=9, column=3, sticky="e", padx=5)
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(fill='both', expand=True, padx=10, pady=10)
+        self.notebook.bind("<<NotebookTabChanged>>", self.render_selected_tab)
 
     def load_data(self):
+        if self.worker is not None:
+            messagebox.showinfo("Busy", "Wait for the running analysis to finish or cancel it first.")
+            return
+        self.column_types = {}
         src = self.data_source_var.get()
         if src == "pre":
             sample = {'text_reviews': ["I love working here!","This job is terrible, I hate it","It's not too bad working here, but it could be better","Absolutely fantastic working here!","Worst job ever!","I love my job","My boss is wonderful and makes my job easier","The best place to work"],
                       'work_life_balance': [4,2,5,1,2,1,3,2]}
-            self.data = pd.DataFrame(sample)
+            with self.tracer.span('load_data', source=src):
+                self.data = pd.DataFrame(sample)
+            self.stream_path = None
             messagebox.showinfo("Info", "Pre-imported sample data loaded.")
         elif src == "csv":
             initial = getattr(sys, 'frozen', False) and os.path.dirname(sys.executable) or os.getcwd()
             file = filedialog.askopenfilename(initialdir=initial, filetypes=[("CSV files","*.csv")])
             if file:
                 try:
-                    self.data = pd.read_csv(file)
+                    if self.stream_var.get():
+                        # Only the header is read now; rows are streamed during analysis.
+                        self.data = pd.read_csv(file, nrows=0)
+                        self.stream_path = file
+                    else:
+                        with self.tracer.span('load_data', source=src, path=file):
+                            self.data = pd.read_csv(file)
+                        self.tracer.count('rows_loaded', len(self.data))
+                        self.stream_path = None
                     messagebox.showinfo("Info", f"CSV data loaded from {file}.")
                 except Exception as e:
                     messagebox.showerror("Error", f"Failed to load CSV: {e}")
@@ -293,13 +329,31 @@ class SentimentApp(tk.Tk):
         else:
             text = self.manual_text.get("1.0","end-1c").strip()
             if text:
-                self.data = pd.DataFrame({"text": text.splitlines()})
+                with self.tracer.span('load_data', source=src):
+                    self.data = pd.DataFrame({"text": text.splitlines()})
+                self.stream_path = None
                 messagebox.showinfo("Info","Manual input data loaded.")
             else:
                 messagebox.showwarning("Warning","No manual input provided.")
                 return
+        self.results = ResultStore(self.data)
         self.update_column_options()
 
+    def get_column_type(self, column):
+        if column not in self.column_types:
+            with self.tracer.span('infer_column_type', column=column):
+                self.column_types[column] = infer_column_type(self.data[column])
+        return self.column_types[column]
+
+    def get_score_cache(self, backend):
+        """Open the persistent score cache for ``backend`` on first use, or return None when it is
+        switched off or the backend is faster than a cache lookup."""
+        if not self.use_cache_var.get():
+            return None
+        if backend not in self.score_caches:
+            self.score_caches[backend] = open_score_cache(backend)
+        return self.score_caches[backend]
+
     def update_column_options(self):
         if self.data is not None:
             cols = list(self.data.columns)
@@ -312,79 +366,145 @@ class SentimentApp(tk.Tk):
         if not col or col not in self.data.columns:
             messagebox.showerror("Error","Selected column not found.")
             return
-        series = self.data[col].astype(str)
-        is_pct = series.str.contains('%').mean() > 0.8
-        if is_pct:
-            nums = series.str.rstrip('%').astype(float)/100.0
+        if self.worker is not None:
+            return
+        # Everything Tk-related is read here; the worker thread only sees plain values.
+        stream_path = self.stream_path
+        series = None if stream_path else self.data[col]
+        column_type = None if stream_path else self.get_column_type(col)
+        backend = list(backend_choices())[self.backend_combobox.current()]
+        workers, chunk_size = self.workers_var.get(), self.chunk_size_var.get()
+        cache = self.score_cache = self.get_score_cache(backend)
+        tracer = self.tracer
+
+        def analyze(progress):
+            if stream_path:
+                return analyze_csv_streaming(stream_path, col, DEFAULT_STREAM_CHUNK_ROWS, workers, chunk_size, cache, progress,
+                                             rating_scaler(col), backend, tracer)
+            if column_type in (NUMERIC, PERCENT):
+                nums = to_numeric_values(series, column_type == PERCENT)
+                return analyze_numeric_column(nums, rating_scaler(col))
+            return analyze_text_column(series, workers, chunk_size, cache, progress, backend, tracer)
+
+        def task(progress):
+            hits, misses = (cache.hits, cache.misses) if cache is not None else (0, 0)
+            with tracer.span('analyze', column=col, backend=backend, streamed=bool(stream_path)):
+                result = analyze(progress)
+            if cache is not None:
+                tracer.count('cache_hits', cache.hits - hits)
+                tracer.count('cache_misses', cache.misses - misses)
+            return result
+
+        self.worker = AnalysisWorker(task)
+        self.analyze_btn.config(state="disabled")
+        self.cancel_btn.config(state="normal")
+        self.progress_bar['value'] = 0
+        self.progress_label.config(text="Starting...")
+        self.worker.start()
+        self.after(PROGRESS_POLL_MS, self.poll_analysis, col, bool(stream_path))
+
+    def cancel_analysis(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.progress_label.config(text="Cancelling...")
+
+    def poll_analysis(self, col, streaming):
+        for kind, payload in self.worker.poll():
+            if kind == 'progress':
+                fraction, rows = payload
+                rate, eta = self.worker.rate(fraction, rows)
+                self.progress_bar['value'] = 100 * fraction
+                eta_text = f", ETA {eta:.0f}s" if eta is not None else ""
+                self.progress_label.config(text=f"{fraction:.0%} - {rows:,} rows at {rate:,.0f} rows/s{eta_text}")
+                continue
+            self.worker = None
+            self.analyze_btn.config(state="normal")
+            self.cancel_btn.config(state="disabled")
+            if kind == 'done':
+                self.progress_bar['value'] = 100
+                self.progress_label.config(text="Done")
+                if streaming:
+                    self.show_streaming_results(payload)
+                else:
+                    self.show_results(col, payload)
+            elif kind == 'cancelled':
+                self.progress_label.config(text="Cancelled")
+            else:
+                self.progress_label.config(text="Failed")
+                messagebox.showerror("Error", f"Analysis failed: {payload}")
+            return
+        self.after(PROGRESS_POLL_MS, self.poll_analysis, col, streaming)
+
+    def show_results(self, col, result):
+        self.results.add(col, result)
+        if result.kind == 'numeric':
+            charts = [("Pie Chart", lambda: generate_sentiment_pie_chart(result)),
+                      ("Scatter Plot", lambda: generate_sentiment_scatter_plot(result)),
+                      ("Bar Chart", lambda: generate_bar_chart_numeric(result))]
+            self.word_cloud_message = "Data analyzed was numerical, so no word cloud was generated."
+            with self.tracer.span('generate_predefined_summary_numeric'):
+                summary = generate_predefined_summary_numeric(result)
         else:
-            nums = pd.to_numeric(self.data[col], errors='coerce')
-        if nums.notnull().mean() > 0.8:
-            self.data['numeric'] = nums
-            self.data['scaled'] = scale_numbers(nums)
-            self.data['rating_sentiment'] = self.data['scaled'].apply(lambda x: 'Negative' if x<=-0.1 else 'Neutral' if x<=0.1 else 'Positive')
-            fig1 = generate_sentiment_pie_chart(self.data)
-            fig2 = generate_sentiment_scatter_plot(self.data)
-            fig3 = generate_bar_chart_numeric(self.data)
+            status = f"Scored {result.unique_count} unique of {result.total} texts ({result.dedup_ratio:.0%} duplicates)"
+            if self.score_cache is not None:
+                stats = self.score_cache.stats()
+                status += f"; score cache: {stats['hits']} hits, {stats['misses']} misses"
+            self.status_label.config(text=status)
+            charts = [("Pie Chart", lambda: generate_pie_chart(result)),
+                      ("Scatter Plot", lambda: generate_scatter_plot(result)),
+                      ("Bar Chart", lambda: generate_bar_chart_text(result)),
+                      ("Positive Word Cloud", lambda: generate_wordcloud(result.word_index.frequencies(2), "Positive Word Cloud")),
+                      ("Negative Word Cloud", lambda: generate_wordcloud(result.word_index.frequencies(0), "Negative Word Cloud"))]
+            self.word_cloud_message = None
+            with self.tracer.span('generate_predefined_summary_text'):
+                summary = generate_predefined_summary_text(result)
+        self.result = result
+        self.display_results(charts, summary)
+
+    def show_streaming_results(self, stream):
+        result = stream.result()
+        if result.kind == 'numeric':
+            charts = [("Pie Chart", lambda: generate_sentiment_pie_chart(result)),
+                      ("Scatter Plot", lambda: generate_distribution_chart(result)),
+                      ("Bar Chart", lambda: generate_bar_chart_numeric(result))]
             self.word_cloud_message = "Data analyzed was numerical, so no word cloud was generated."
-            counts = self.data['rating_sentiment'].value_counts()
-            total = counts.sum()
-            pos_pct = counts.get('Positive',0)/total*100
-            neu_pct = counts.get('Neutral',0)/total*100
-            neg_pct = counts.get('Negative',0)/total*100
-            avg = self.data['numeric'].mean()
-            summary = generate_predefined_summary_numeric(pos_pct, neu_pct, neg_pct, avg)
+            with self.tracer.span('generate_predefined_summary_numeric'):
+                summary = generate_predefined_summary_numeric(result)
         else:
-            self.data['sentiment'], self.data['polarity'] = zip(*self.data[col].apply(analyze_sentiment))
-            fig1 = generate_pie_chart(self.data)
-            fig2 = generate_scatter_plot(self.data)
-            fig3 = generate_bar_chart_text(self.data)
-            pos_txt = ' '.join(self.data[self.data['sentiment']=='Positive'][col].dropna().astype(str))
-            neg_txt = ' '.join(self.data[self.data['sentiment']=='Negative'][col].dropna().astype(str))
-            self.fig_pos_wc = generate_wordcloud(pos_txt, "Positive Word Cloud")
-            self.fig_neg_wc = generate_wordcloud(neg_txt, "Negative Word Cloud")
+            charts = [("Pie Chart", lambda: generate_pie_chart(result)),
+                      ("Scatter Plot", lambda: generate_distribution_chart(result)),
+                      ("Bar Chart", lambda: generate_bar_chart_text(result)),
+                      ("Positive Word Cloud", lambda: generate_wordcloud(result.word_index.frequencies(2), "Positive Word Cloud")),
+                      ("Negative Word Cloud", lambda: generate_wordcloud(result.word_index.frequencies(0), "Negative Word Cloud"))]
             self.word_cloud_message = None
-            counts = self.data['sentiment'].value_counts().to_dict()
-            avg_pol = self.data['polarity'].mean()
-            summary = generate_predefined_summary_text(counts, avg_pol)
-        self.display_results(fig1, fig2, fig3, summary)
-
-    def display_results(self, fig1, fig2, fig3, summary):
+            with self.tracer.span('generate_predefined_summary_text'):
+                summary = generate_predefined_summary_text(result)
+        self.status_label.config(text=f"Streamed {stream.rows} rows")
+        self.result = result
+        self.display_results(charts, summary)
+
+    def display_results(self, charts, summary):
+        """Add a placeholder tab per (title, build_figure) chart; figures are built when their tab is first shown."""
+        with self.tracer.span('display_results', charts=len(charts)):
+            self.add_result_tabs(charts, summary)
+            self.notebook.select(0)
+            self.render_selected_tab()
+
+    def add_result_tabs(self, charts, summary):
         for child in self.notebook.winfo_children():
             child.destroy()
-        # Pie
-        f1 = ttk.Frame(self.notebook)
-        self.notebook.add(f1, text="Pie Chart")
-        c1 = FigureCanvasTkAgg(fig1, master=f1)
-        c1.draw(); c1.get_tk_widget().pack(fill='both',expand=True)
-        plt.close(fig1)
-        # Scatter
-        f2 = ttk.Frame(self.notebook)
-        self.notebook.add(f2, text="Scatter Plot")
-        c2 = FigureCanvasTkAgg(fig2, master=f2)
-        c2.draw(); c2.get_tk_widget().pack(fill='both',expand=True)
-        plt.close(fig2)
-        # Bar
-        f3 = ttk.Frame(self.notebook)
-        self.notebook.add(f3, text="Bar Chart")
-        c3 = FigureCanvasTkAgg(fig3, master=f3)
-        c3.draw(); c3.get_tk_widget().pack(fill='both',expand=True)
-        plt.close(fig3)
-        # Word Clouds or message
+        self.pending_charts = {}
+        for title, build_figure in charts:
+            f = ttk.Frame(self.notebook)
+            self.notebook.add(f, text=title)
+            placeholder = tk.Label(f, text="Rendering...", font=("Arial",14))
+            placeholder.pack(expand=True, fill='both')
+            self.pending_charts[str(f)] = (title, build_figure, placeholder)
+        # Word cloud message
         if self.word_cloud_message:
             fw = ttk.Frame(self.notebook)
             self.notebook.add(fw, text="Word Cloud")
             tk.Label(fw, text=self.word_cloud_message, font=("Arial",14)).pack(expand=True, fill='both', padx=10, pady=10)
-        else:
-            fp = ttk.Frame(self.notebook)
-            self.notebook.add(fp, text="Positive Word Cloud")
-            cp = FigureCanvasTkAgg(self.fig_pos_wc, master=fp)
-            cp.draw(); cp.get_tk_widget().pack(fill='both',expand=True)
-            plt.close(self.fig_pos_wc)
-            fn = ttk.Frame(self.notebook)
-            self.notebook.add(fn, text="Negative Word Cloud")
-            cn = FigureCanvasTkAgg(self.fig_neg_wc, master=fn)
-            cn.draw(); cn.get_tk_widget().pack(fill='both',expand=True)
-            plt.close(self.fig_neg_wc)
         # Summary
         fs = ttk.Frame(self.notebook)
         self.notebook.add(fs, text="Summary")
@@ -392,6 +512,55 @@ class SentimentApp(tk.Tk):
         tw.insert(tk.END, summary)
         tw.config(state="disabled")
         tw.pack(fill='both', expand=True)
+        self.add_diagnostics_tab()
+
+    def add_diagnostics_tab(self):
+        """Per-phase timings and counters recorded so far, refreshed whenever the tab is shown."""
+        self.diagnostics_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.diagnostics_frame, text="Diagnostics")
+        buttons = ttk.Frame(self.diagnostics_frame)
+        buttons.pack(fill='x', pady=5)
+        ttk.Button(buttons, text="Export Chrome Trace...", command=self.export_trace).pack(side='left', padx=5)
+        ttk.Button(buttons, text="Clear", command=self.clear_trace).pack(side='left', padx=5)
+        self.diagnostics_text = tk.Text(self.diagnostics_frame, wrap='none', font=("Courier",11))
+        self.diagnostics_text.pack(fill='both', expand=True)
+
+    def refresh_diagnostics(self):
+        self.diagnostics_text.config(state="normal")
+        self.diagnostics_text.delete("1.0", tk.END)
+        self.diagnostics_text.insert(tk.END, self.tracer.report() + "\n\n" + self.results.memory_report())
+        self.diagnostics_text.config(state="disabled")
+
+    def toggle_tracing(self):
+        self.tracer.enabled = self.trace_var.get()
+
+    def export_trace(self):
+        path = filedialog.asksaveasfilename(defaultextension=".json", initialfile="wlb-trace.json",
+                                            filetypes=[("Chrome trace","*.json")])
+        if path:
+            self.tracer.export(path)
+            messagebox.showinfo("Info", f"Trace written to {path}; open it in chrome://tracing or ui.perfetto.dev.")
+
+    def clear_trace(self):
+        self.tracer.clear()
+        self.refresh_diagnostics()
+
+    def render_selected_tab(self, event=None):
+        selected = self.notebook.select()
+        if self.diagnostics_frame is not None and selected == str(self.diagnostics_frame):
+            self.refresh_diagnostics()
+            return
+        pending = self.pending_charts.pop(selected, None)
+        if pending is None:
+            return
+        title, build_figure, placeholder = pending
+        with self.tracer.span(f'generate_figure: {title}'):
+            fig = build_figure()
+        placeholder.destroy()
+        with self.tracer.span(f'draw_canvas: {title}'):
+            c = FigureCanvasTkAgg(fig, master=self.nametowidget(selected))
+            c.draw(); c.get_tk_widget().pack(fill='both',expand=True)
+        plt.close(fig)
 
     def add_placeholder(self, widget, text):
         widget.insert("1.0", text)
@@ -407,5 +576,9 @@ class SentimentApp(tk.Tk):
             self.add_placeholder(widget, text)
 
 if __name__ == "__main__":
+    # Needed for the process pool in the frozen PyInstaller build.
+    multiprocessing.freeze_support()
     app = SentimentApp()
+    if os.environ.get("WLB_STARTUP_REPORT"):
+        app.after_idle(lambda: print(f"window ready {time.perf_counter() - STARTUP_T0:.2f}s after startup", file=sys.stderr))
     app.mainloop()
@@ -0,0 +1,91 @@
+class LexiconScorer:
+    """Batch polarity scorer built on TextBlob's pattern lexicon.
+
+    The lexicon is flattened once into a plain ``word -> (polarity, intensity, is_modifier)``
+    table so scoring a review is a single walk over its tokens instead of building a
+    ``TextBlob`` per row. The walk mirrors ``textblob._text.Sentiment.assessments`` so the
+    polarity matches ``TextBlob(text).sentiment.polarity``.
+    """
+
+    def __init__(self):
+        # Imported here so importing this module (at app startup) does not load TextBlob and NLTK.
+        from textblob.en import sentiment as pattern_sentiment
+        from textblob._text import EMOTICONS, PUNCTUATION
+        self.punctuation = PUNCTUATION
+        self.table = {}
+        for word, tags in pattern_sentiment.items():
+            polarity, _, intensity = tags[None]
+            self.table[word] = (polarity, intensity, "RB" in tags)
+        self.negations = frozenset(pattern_sentiment.negations)
+        self.tokenizer = pattern_sentiment.tokenizer
+        self.emoticons = {}
+        for (_, polarity), forms in EMOTICONS.items():
+            for form in forms:
+                self.emoticons.setdefault(form.lower(), polarity)
+
+    def tokenize(self, text):
+        return " ".join(self.tokenizer(text)).lower().split()
+
+    def polarity(self, text):
+        """Return the TextBlob polarity of a single string."""
+        return self.polarity_from_tokens(self.tokenize(text))
+
+    def polarity_from_tokens(self, tokens):
+        table = self.table
+        # Each assessment is [polarity, intensity, negated].
+        assessments = []
+        modifier = None
+        negation = None
+        for w in tokens:
+            entry = table.get(w)
+            if entry is not None:
+                p, i, is_modifier = entry
+                if modifier is None:
+                    assessments.append([p, i, False])
+                else:
+                    last = assessments[-1]
+                    last[0] = max(-1.0, min(p * last[1], 1.0))
+                    last[1] = i
+                if negation is not None:
+                    last = assessments[-1]
+                    last[1] = 1.0 / (last[1] or 1)
+                    last[2] = True
+                modifier = w if is_modifier else None
+                negation = w if w in self.negations else None
+            else:
+                if w in self.negations:
+                    negation = w
+                elif negation and len(w.strip("'")) > 1:
+                    negation = None
+                if negation is not None and modifier is not None and modifier.endswith("ly"):
+                    assessments[-1][2] = True
+                    negation = None
+                elif modifier and len(w) > 2:
+                    modifier = None
+                if w == "!" and assessments:
+                    assessments[-1][0] = max(-1.0, min(assessments[-1][0] * 1.25, 1.0))
+                if w == "(!)":
+                    assessments.append([0.0, 1.0, False])
+                if not w.isalpha() and len(w) <= 5 and w not in self.punctuation and w in self.emoticons:
+                    assessments.append([self.emoticons[w], 1.0, False])
+        if not assessments:
+            return 0.0
+        total = 0.0
+        for p, _, negated in assessments:
+            total += p * -0.5 if negated else p
+        return total / len(assessments)
+
+    def score(self, texts):
+        """Return a list of polarities for an iterable of strings."""
+        return [self.polarity(text) for text in texts]
+
+
+_scorer = None
+
+
+def get_scorer():
+    """Return the process-wide scorer, building the lexicon table on first use."""
+    global _scorer
+    if _scorer is None:
+        _scorer = LexiconScorer()
+    return _scorer
@@ -0,0 +1,64 @@
+"""Import-time report for an app's startup path, built on ``python -X importtime``.
+
+    python startup_report.py                          # the PyInstaller app, sentiment_analysis_app
+    python startup_report.py main --top 30 --budget 1.0
+
+Each module is imported in a fresh interpreter so nothing is already cached. With ``--budget``
+the exit status is 1 when the total import time exceeds it, so the check can run in CI. Run
+the app itself with ``WLB_STARTUP_REPORT=1`` to also print when its window first becomes idle.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+# "import time: <self us> | <cumulative us> | <indent><module>"; nesting adds two spaces per level.
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(module, cwd=None):
+    """Import ``module`` with -X importtime and return ``[(name, self_us, cumulative_us, depth)]``."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=cwd, capture_output=True, text=True)
+    if proc.returncode:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr.strip()}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return rows
+
+
+def report(module, top=20, cwd=None, out=sys.stdout):
+    """Print the slowest top-level imports of ``module`` and return the total in seconds."""
+    rows = import_times(module, cwd)
+    top_level = [row for row in rows if row[3] == 0]
+    total = sum(cumulative for _, _, cumulative, _ in top_level) / 1e6
+    print(f"Importing {module}: {total:.3f}s total", file=out)
+    print(f"{'cumulative':>12} {'self':>10}  module", file=out)
+    for name, self_us, cumulative_us, _ in sorted(top_level, key=lambda row: -row[2])[:top]:
+        print(f"{cumulative_us / 1e3:10.1f}ms {self_us / 1e3:8.1f}ms  {name}", file=out)
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=["sentiment_analysis_app"], help="Modules to import.")
+    parser.add_argument("--top", type=int, default=20, help="How many top-level imports to list.")
+    parser.add_argument("--budget", type=float, help="Fail when a module takes longer than this many seconds.")
+    args = parser.parse_args(argv)
+    here = os.path.dirname(os.path.abspath(__file__))
+    over_budget = False
+    for module in args.modules:
+        total = report(module, args.top, cwd=here)
+        if args.budget is not None and total > args.budget:
+            print(f"over budget: {total:.3f}s > {args.budget:.3f}s", file=sys.stderr)
+            over_budget = True
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+import os
+import numpy as np
+import pandas as pd
+from analysis_function import (AnalysisResult, deduplicate_texts, score_unique_texts, index_words,
+                               rating_codes, to_numeric_values, RatingScaler, SCALE_RUNNING)
+from sentiment_backends import BACKEND_TEXTBLOB, get_backend
+from column_types import infer_column_type, NUMERIC, PERCENT
+from parallel_scoring import DEFAULT_CHUNK_SIZE
+from word_index import WordFrequencyIndex
+from diagnostics import DISABLED_TRACER
+
+DEFAULT_STREAM_CHUNK_ROWS = 100_000
+HISTOGRAM_BINS = 20
+# Distinct ratings are counted exactly up to MAX_EXACT_RATINGS, then in RATING_BINS fixed-width
+# bins, so a continuous or high-cardinality numeric column cannot grow the aggregates.
+MAX_EXACT_RATINGS = 10_000
+RATING_BINS = 4096
+
+
+class StreamingAnalysis:
+    """Running aggregates for one column of a CSV that is read chunk by chunk.
+
+    Only label counts, the polarity sum and histogram, rating counts and word frequencies are
+    kept, so memory stays flat however large the file is. Ratings are counted per distinct value
+    until there are more than MAX_EXACT_RATINGS of them, then per bin; from then on the median,
+    the distribution and fit-scaled labels are taken from bin centers, while the count, average,
+    min and max stay exact.
+    """
+
+    def __init__(self, kind, is_percent=False, scaler=None, backend=BACKEND_TEXTBLOB):
+        self.kind = kind
+        self.is_percent = is_percent
+        self.scaler = scaler if scaler is not None else RatingScaler()
+        self.backend = backend
+        self.rows = 0
+        self.unique_texts = 0
+        self.label_counts = np.zeros(3, dtype=np.int64)
+        self.polarity_sum = 0.0
+        self.bin_edges = np.linspace(-1, 1, HISTOGRAM_BINS + 1)
+        self.polarity_hist = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+        self.rating_counts = {}
+        # Replaces rating_counts past MAX_EXACT_RATINGS: bin i counts [low + i * width, low + (i + 1) * width).
+        self.rating_bins = None
+        self.rating_low = 0.0
+        self.rating_bin_width = 1.0
+        self.rating_total = 0
+        self.rating_sum = 0.0
+        self.rating_min = float('inf')
+        self.rating_max = float('-inf')
+        self.missing = 0
+        self.word_index = WordFrequencyIndex()
+
+    def update(self, series, workers=1, chunk_size=DEFAULT_CHUNK_SIZE, cache=None):
+        if self.kind == 'numeric':
+            self.update_numeric(series)
+        else:
+            self.update_text(series, workers, chunk_size, cache)
+        self.rows += len(series)
+
+    def update_text(self, series, workers=1, chunk_size=DEFAULT_CHUNK_SIZE, cache=None):
+        codes, uniques = deduplicate_texts(series)
+        scores = score_unique_texts(uniques, workers, chunk_size, cache, backend=self.backend)
+        labels = get_backend(self.backend).codes(scores)
+        occurrences = np.bincount(codes, minlength=len(uniques))
+        self.label_counts += np.bincount(labels, weights=occurrences, minlength=3).astype(np.int64)
+        self.polarity_sum += float(np.dot(scores, occurrences))
+        self.polarity_hist += np.histogram(scores, bins=self.bin_edges, weights=occurrences)[0].astype(np.int64)
+        index_words(series, codes, uniques, labels, self.word_index)
+        self.unique_texts += len(uniques)
+
+    def update_numeric(self, series):
+        values = to_numeric_values(series, self.is_percent)
+        self.missing += int(values.isna().sum())
+        if self.scaler.mode == SCALE_RUNNING:
+            # Each chunk is labelled against the min/max seen so far, so labels are final as soon as
+            # the chunk is read (missing values fall through to Positive, as on the in-memory path).
+            self.scaler.partial_fit(values)
+            self.label_counts += np.bincount(rating_codes(self.scaler.transform(values)), minlength=3)
+        present = values.dropna()
+        if not len(present):
+            return
+        self.rating_total += len(present)
+        self.rating_sum += float(present.sum())
+        self.rating_min = min(self.rating_min, float(present.min()))
+        self.rating_max = max(self.rating_max, float(present.max()))
+        if self.rating_bins is not None:
+            self.bin_ratings(present.to_numpy(dtype=float), np.ones(len(present)))
+            return
+        for value, count in present.value_counts().items():
+            self.rating_counts[value] = self.rating_counts.get(value, 0) + int(count)
+        if len(self.rating_counts) > MAX_EXACT_RATINGS:
+            self.start_rating_bins()
+
+    def start_rating_bins(self):
+        """Move the exact rating counts into RATING_BINS bins spanning the ratings seen so far."""
+        values = np.fromiter(self.rating_counts.keys(), dtype=float, count=len(self.rating_counts))
+        counts = np.fromiter(self.rating_counts.values(), dtype=float, count=len(self.rating_counts))
+        self.rating_counts = {}
+        finite = values[np.isfinite(values)]
+        self.rating_low = float(finite.min())
+        # Slightly wider than the span, so the largest rating falls inside the last bin.
+        self.rating_bin_width = (float(finite.max()) - self.rating_low) / RATING_BINS * (1 + 1e-9) or 1.0
+        self.rating_bins = np.zeros(RATING_BINS, dtype=np.int64)
+        self.bin_ratings(values, counts)
+
+    def bin_ratings(self, values, counts):
+        # Infinite ratings still count towards the exact stats but have no bin.
+        finite = np.isfinite(values)
+        values, counts = values[finite], counts[finite]
+        if not len(values):
+            return
+        self.widen_rating_bins(values.min(), values.max())
+        index = np.minimum(((values - self.rating_low) // self.rating_bin_width).astype(np.int64), RATING_BINS - 1)
+        self.rating_bins += np.bincount(index, weights=counts, minlength=RATING_BINS).astype(np.int64)
+
+    def widen_rating_bins(self, low, high):
+        """Double the bin width, merging neighbouring bins, until the bins cover ``[low, high]``."""
+        while low < self.rating_low or high >= self.rating_low + self.rating_bin_width * RATING_BINS:
+            # Grow towards the side that is out of range: old bin i lands in new bin (i + shift) // 2.
+            shift = RATING_BINS if low < self.rating_low else 0
+            merged = np.zeros(RATING_BINS, dtype=np.int64)
+            np.add.at(merged, (np.arange(RATING_BINS) + shift) // 2, self.rating_bins)
+            self.rating_low -= self.rating_bin_width * shift
+            self.rating_bin_width *= 2
+            self.rating_bins = merged
+
+    def rating_distribution(self):
+        """Distinct ratings (or bin centers, once binned) and how often each occurred, sorted by rating."""
+        if self.rating_bins is not None:
+            filled = np.flatnonzero(self.rating_bins)
+            return self.rating_low + (filled + 0.5) * self.rating_bin_width, self.rating_bins[filled]
+        ratings = pd.Series(self.rating_counts, dtype='int64').sort_index()
+        return ratings.index.to_numpy(dtype=float), ratings.to_numpy()
+
+    def numeric_stats(self):
+        values, counts = self.rating_distribution()
+        if not self.rating_total or not len(values):
+            return {'average': float('nan'), 'median': float('nan'), 'min': float('nan'), 'max': float('nan'),
+                    'distribution': pd.Series(dtype='int64')}
+        cumulative = np.cumsum(counts)
+        total = cumulative[-1]
+        # Median of the expanded values, averaging the two middle ones for an even count; within
+        # half a bin width of the true median once the ratings are binned.
+        lower = values[np.searchsorted(cumulative, (total + 1) // 2)]
+        upper = values[np.searchsorted(cumulative, total // 2 + 1)]
+        return {
+            'average': self.rating_sum / self.rating_total,
+            'median': float((lower + upper) / 2),
+            'min': self.rating_min,
+            'max': self.rating_max,
+            'distribution': pd.Series(counts, index=values),
+        }
+
+    def result(self):
+        """Summarize the aggregates as an AnalysisResult for the charts and summaries."""
+        if self.kind == 'text':
+            mean = self.polarity_sum / self.rows if self.rows else float('nan')
+            return AnalysisResult.from_aggregates('text', self.label_counts, mean,
+                                                  (self.polarity_hist, self.bin_edges), self.unique_texts,
+                                                  self.word_index)
+
+        values, counts = self.rating_distribution()
+        if len(values):
+            histogram = np.histogram(values, bins=HISTOGRAM_BINS, weights=counts)
+        else:
+            histogram = (np.zeros(HISTOGRAM_BINS), np.linspace(0, 1, HISTOGRAM_BINS + 1))
+        if self.scaler.mode == SCALE_RUNNING:
+            label_counts = self.label_counts.copy()
+        else:
+            # Fixed or fit-on-all scaling of the distinct ratings, weighted by how often each occurred.
+            scaled = self.scaler.fit(values).transform(values)
+            label_counts = np.bincount(rating_codes(scaled), weights=counts, minlength=3).astype(np.int64)
+            # Unparseable ratings are labelled Positive on the in-memory path too.
+            label_counts[2] += self.missing
+        return AnalysisResult.from_aggregates('numeric', label_counts, self.numeric_stats()['average'], histogram)
+
+
+def analyze_csv_streaming(path, column, chunk_rows=DEFAULT_STREAM_CHUNK_ROWS, workers=1,
+                          chunk_size=DEFAULT_CHUNK_SIZE, cache=None, progress=None, scaler=None,
+                          backend=BACKEND_TEXTBLOB, tracer=DISABLED_TRACER):
+    """Read ``column`` of a CSV ``chunk_rows`` at a time and return the filled StreamingAnalysis.
+
+    The column type (numeric, percent or text) is decided from the first chunk. Ratings are
+    scaled with ``scaler`` (a RatingScaler, fit on all values by default) and texts scored with
+    the registered sentiment ``backend``. ``progress``, if
+    given, is called as ``progress(fraction_done, rows_done)`` after every chunk, where the
+    fraction is the share of the file's bytes read so far. ``tracer`` times the parsing, type
+    inference and analysis of each chunk separately.
+    """
+    stream = None
+    size = os.path.getsize(path) or 1
+    with open(path, 'rb') as handle:
+        chunks = iter(pd.read_csv(handle, usecols=[column], chunksize=chunk_rows))
+        while True:
+            with tracer.span('read_csv_chunk'):
+                chunk = next(chunks, None)
+            if chunk is None:
+                break
+            series = chunk[column]
+            if stream is None:
+                with tracer.span('infer_column_type', column=column):
+                    column_type = infer_column_type(series)
+                stream = StreamingAnalysis('numeric' if column_type in (NUMERIC, PERCENT) else 'text',
+                                           column_type == PERCENT, scaler, backend)
+            with tracer.span('analyze_chunk', rows=len(series)):
+                stream.update(series, workers, chunk_size, cache)
+            tracer.count('rows_streamed', len(series))
+            if progress is not None:
+                progress(min(handle.tell() / size, 1.0), stream.rows)
+    if stream is None:
+        raise ValueError(f"No rows found in {path}.")
+    return stream
@@ -0,0 +1,117 @@
+"""Seeded synthetic employee reviews shaped like the Employees_Reviews_Dataset columns.
+
+    python synthetic_reviews.py 100000 --out reviews.csv
+
+Likes and Dislikes are built from clauses of review vocabulary, so most rows are distinct, while
+``duplicate_rate`` of them are stock answers ("Nothing", "Good work life balance", ...) drawn
+with a Zipf-like skew, as in real exports. Ratings are 1-5, skewed towards 3-4, and lean on the
+tone of the Dislikes: reviews with more complaints get lower ratings. The same ``seed`` and
+``n_rows`` always give the same frame.
+"""
+import argparse
+import numpy as np
+import pandas as pd
+
+DUPLICATE_RATE = 0.35
+MISSING_RATE = 0.05
+RATING_WEIGHTS = [0.08, 0.12, 0.25, 0.30, 0.25]
+MAX_CLAUSES = 3
+
+SUBJECTS = np.array([
+    "work life balance", "management", "my manager", "the team", "colleagues", "the culture",
+    "salary", "the hike", "appraisal process", "job security", "learning opportunities",
+    "working hours", "the office", "leadership", "the project", "training", "onboarding",
+    "growth", "benefits", "the work", "HR", "the canteen", "the commute", "shift timings",
+    "remote work policy", "leave policy", "the client", "senior management", "teammates",
+], dtype=object)
+CAPITALIZED_SUBJECTS = np.array([s[:1].upper() + s[1:] for s in SUBJECTS], dtype=object)
+PRAISE = np.array([
+    "is good", "is great", "is very supportive", "is flexible", "is excellent", "is friendly",
+    "is really helpful", "is decent", "is awesome", "gives freedom", "is transparent",
+    "is better than most companies", "is nice", "is amazing", "keeps improving",
+], dtype=object)
+COMPLAINTS = np.array([
+    "is poor", "is bad", "is very low", "is terrible", "is not transparent", "is stressful",
+    "is too long", "is not flexible", "is worst", "needs improvement", "is biased", "is unfair",
+    "is hectic", "is below industry standard", "is slow", "is disappointing", "is toxic",
+], dtype=object)
+NEUTRAL = np.array([
+    "is okay", "is average", "is as expected", "depends on the project", "is manageable",
+    "varies by team", "is fine", "is standard",
+], dtype=object)
+STOCK_LIKES = np.array([
+    "Good work life balance", "Nothing", "Good", "Work life balance", "Job security", "Good culture",
+    "Friendly environment", "Learning", "Nothing much", "NA", "Flexible timings", "Good salary",
+], dtype=object)
+STOCK_DISLIKES = np.array([
+    "Nothing", "Salary", "Low salary", "Nothing to dislike", "No work life balance", "Management",
+    "NA", "Politics", "Less hike", "Work pressure", "Nothing as such", "Long working hours",
+], dtype=object)
+
+
+def zipf_choice(rng, values, size, exponent=1.1):
+    """Draw from ``values`` with the first entries far more common than the last."""
+    weights = 1.0 / np.arange(1, len(values) + 1) ** exponent
+    return values[rng.choice(len(values), size=size, p=weights / weights.sum())]
+
+
+def clauses(rng, n_rows, verbs, verb_share, n_clauses):
+    """Comma-joined "subject verb" clauses; ``verb_share`` of them use ``verbs``, the rest NEUTRAL."""
+    texts = None
+    for k in range(MAX_CLAUSES):
+        tone = rng.random(n_rows) < verb_share
+        verb = np.where(tone, verbs[rng.integers(len(verbs), size=n_rows)],
+                        NEUTRAL[rng.integers(len(NEUTRAL), size=n_rows)])
+        # Reviews start with a capital letter, like the dataset.
+        subjects = CAPITALIZED_SUBJECTS if texts is None else SUBJECTS
+        clause = subjects[rng.integers(len(SUBJECTS), size=n_rows)] + " " + verb
+        if texts is None:
+            texts = clause
+        else:
+            more = n_clauses > k
+            texts[more] = texts[more] + ", " + clause[more]
+    return texts
+
+
+def review_column(rng, n_rows, verbs, verb_share, n_clauses, stock, duplicate_rate, missing_rate):
+    texts = clauses(rng, n_rows, verbs, verb_share, n_clauses)
+    stock_rows = rng.random(n_rows) < duplicate_rate
+    texts[stock_rows] = zipf_choice(rng, stock, int(stock_rows.sum()))
+    texts[rng.random(n_rows) < missing_rate] = None
+    return texts
+
+
+def generate_reviews(n_rows, seed=0, duplicate_rate=DUPLICATE_RATE, missing_rate=MISSING_RATE):
+    """A DataFrame of ``n_rows`` reviews: Likes, Dislikes, work_life_balance and work_satisfaction.
+
+    Ratings are floats with ``missing_rate`` of them NaN, as pandas reads them from a CSV export.
+    """
+    rng = np.random.default_rng(seed)
+    rating = rng.choice(np.arange(1, 6), size=n_rows, p=RATING_WEIGHTS)
+    # More complaint clauses for low ratings, more praise for high ones.
+    complaints = np.clip(MAX_CLAUSES - rating // 2 + rng.integers(-1, 2, size=n_rows), 1, MAX_CLAUSES)
+    praise = np.clip(rating // 2 + rng.integers(0, 2, size=n_rows), 1, MAX_CLAUSES)
+    likes = review_column(rng, n_rows, PRAISE, 0.8, praise, STOCK_LIKES, duplicate_rate, missing_rate)
+    dislikes = review_column(rng, n_rows, COMPLAINTS, 0.8, complaints, STOCK_DISLIKES, duplicate_rate, missing_rate)
+    satisfaction = np.clip(rating + rng.integers(-1, 2, size=n_rows), 1, 5).astype(float)
+    wlb = rating.astype(float)
+    wlb[rng.random(n_rows) < missing_rate] = np.nan
+    satisfaction[rng.random(n_rows) < missing_rate] = np.nan
+    return pd.DataFrame({'Likes': likes, 'Dislikes': dislikes, 'work_life_balance': wlb,
+                         'work_satisfaction': satisfaction})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('rows', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--duplicate-rate', type=float, default=DUPLICATE_RATE)
+    parser.add_argument('--out', default='synthetic_reviews.csv')
+    args = parser.parse_args(argv)
+    df = generate_reviews(args.rows, args.seed, args.duplicate_rate)
+    df.to_csv(args.out, index=False)
+    print(f"wrote {len(df)} rows to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,258 @@
+"""Batch VADER compound scoring that reproduces NLTK's ``polarity_scores(text)['compound']``.
+
+``SentimentIntensityAnalyzer.polarity_scores`` builds a dictionary of every word joined with
+every punctuation mark for each text before it looks anything up, and rescans the word list
+for each token. ``BatchVaderScorer`` reads the lexicon, booster, negation and idiom tables
+from an NLTK analyzer once, strips punctuation with one precompiled regex, returns 0.0 without
+walking the rules when a text has no lexicon words, and applies the same rules in the same
+order (including NLTK's first-occurrence indexing of repeated words) for the rest.
+
+Check it against NLTK on the reviews dataset:
+
+    python vader_batch.py --rows 20000
+"""
+import argparse
+import sys
+import time
+
+# Rows and columns the GUI scores; kept in step with main.py without importing the GUI.
+DATASET_NAME = "kmrmanish/Employees_Reviews_Dataset"
+TEXT_COLUMNS = ["work_life_balance", "work_satisfaction", "Likes", "Dislikes"]
+PARITY_TOLERANCE = 1e-9
+TARGET_SPEEDUP = 10.0
+MAX_CACHED_TOKENS = 500_000
+MISSING = object()
+
+
+class BatchVaderScorer:
+    """Compound scores for many texts from the tables of one NLTK ``SentimentIntensityAnalyzer``."""
+
+    def __init__(self, analyzer):
+        constants = analyzer.constants
+        self.lexicon = analyzer.lexicon
+        self.boosters = constants.BOOSTER_DICT
+        self.idioms = constants.SPECIAL_CASE_IDIOMS
+        self.negations = frozenset(constants.NEGATE)
+        self.punctuation = constants.REGEX_REMOVE_PUNCTUATION
+        self.punc_marks = frozenset(constants.PUNC_LIST)
+        self.c_incr = constants.C_INCR
+        self.b_decr = constants.B_DECR
+        self.n_scalar = constants.N_SCALAR
+        self.normalize = constants.normalize
+        # Whitespace-separated token -> (word, lowered word, in lexicon, all caps), or None when VADER drops
+        # it; review text repeats the same tokens, so each is cleaned once per scorer.
+        self.tokens = {}
+
+    def clean(self, token):
+        """NLTK's ``SentiText.words_and_emoticons`` for one token, without the word-by-punctuation product.
+
+        A token loses its punctuation only when that punctuation is one of VADER's marks sitting
+        wholly before or wholly after a word of two or more characters, which is exactly when it
+        would be a key of NLTK's lookup table. Tokens shorter than two characters are dropped.
+        """
+        if len(token) < 2:
+            return None
+        word = self.punctuation.sub("", token)
+        if len(word) > 1 and word != token:
+            cut = len(token) - len(word)
+            if (token.endswith(word) and token[:cut] in self.punc_marks) or \
+                    (token.startswith(word) and token[len(word):] in self.punc_marks):
+                token = word
+        lowered = token.lower()
+        return token, lowered, lowered in self.lexicon, token.isupper()
+
+    def tokenize(self, text):
+        """Words of ``text`` as NLTK's ``SentiText`` splits them, plus what the rules need.
+
+        Returns ``(words, lowered, allcaps, hits)``: the words, their lowercase forms, how many
+        are ALL CAPS and the positions of the lexicon words.
+        """
+        tokens = self.tokens
+        if len(tokens) > MAX_CACHED_TOKENS:
+            tokens.clear()
+        words = []
+        lowered = []
+        hits = []
+        allcaps = 0
+        for token in text.split():
+            entry = tokens.get(token, MISSING)
+            if entry is MISSING:
+                entry = tokens[token] = self.clean(token)
+            if entry is not None:
+                word, lower, in_lexicon, upper = entry
+                if in_lexicon:
+                    hits.append(len(words))
+                words.append(word)
+                lowered.append(lower)
+                allcaps += upper
+        return words, lowered, allcaps, hits
+
+    def is_negation(self, lowered):
+        return lowered in self.negations or "n't" in lowered
+
+    def compound(self, text):
+        """Compound score of one string, equal to NLTK's."""
+        words, lowered, allcaps, hits = self.tokenize(text)
+        if not hits:
+            return 0.0
+        n = len(words)
+        cap_diff = 0 < n - allcaps < n
+        # Words outside the lexicon always score 0, so only the lexicon words walk the rules.
+        sentiments = [0] * n
+        for k in hits:
+            # NLTK scores every repeat of a word at the position of its first occurrence.
+            sentiments[k] = self.valence(words, lowered, words.index(words[k]), cap_diff)
+        if "but" in lowered:
+            bi = lowered.index("but")
+            sentiments = [s * 0.5 if k < bi else s * 1.5 if k > bi else s
+                          for k, s in enumerate(sentiments)]
+        sum_s = float(sum(sentiments))
+        if sum_s:
+            emphasis = min(text.count("!"), 4) * 0.292
+            questions = text.count("?")
+            if questions > 1:
+                emphasis += questions * 0.18 if questions <= 3 else 0.96
+            sum_s = sum_s + emphasis if sum_s > 0 else sum_s - emphasis
+        # polarity_scores reports the compound score rounded to four places.
+        return round(self.normalize(sum_s), 4)
+
+    def valence(self, words, lowered, i, cap_diff):
+        """Valence of the word at ``i`` after the booster, caps, negation, idiom and "least" rules."""
+        low = lowered[i]
+        lexicon = self.lexicon
+        if (i < len(words) - 1 and low == "kind" and lowered[i + 1] == "of") or low in self.boosters:
+            return 0
+        valence = lexicon[low]
+        if cap_diff and words[i].isupper():
+            valence = valence + self.c_incr if valence > 0 else valence - self.c_incr
+        for start_i in range(3):
+            if i <= start_i or lowered[i - start_i - 1] in lexicon:
+                continue
+            before = words[i - start_i - 1]
+            scalar = 0.0
+            if lowered[i - start_i - 1] in self.boosters:
+                scalar = self.boosters[lowered[i - start_i - 1]]
+                if valence < 0:
+                    scalar *= -1
+                if cap_diff and before.isupper():
+                    scalar = scalar + self.c_incr if valence > 0 else scalar - self.c_incr
+            if start_i == 1 and scalar != 0:
+                scalar = scalar * 0.95
+            if start_i == 2 and scalar != 0:
+                scalar = scalar * 0.9
+            valence = valence + scalar
+            valence = self.never_check(valence, words, lowered, start_i, i)
+            if start_i == 2:
+                valence = self.idioms_check(valence, words, i)
+        if i > 1 and lowered[i - 1] not in lexicon and lowered[i - 1] == "least":
+            if lowered[i - 2] != "at" and lowered[i - 2] != "very":
+                valence = valence * self.n_scalar
+        elif i > 0 and lowered[i - 1] not in lexicon and lowered[i - 1] == "least":
+            valence = valence * self.n_scalar
+        return valence
+
+    def never_check(self, valence, words, lowered, start_i, i):
+        if start_i == 0:
+            if self.is_negation(lowered[i - 1]):
+                valence = valence * self.n_scalar
+        elif start_i == 1:
+            if words[i - 2] == "never" and words[i - 1] in ("so", "this"):
+                valence = valence * 1.5
+            elif self.is_negation(lowered[i - 2]):
+                valence = valence * self.n_scalar
+        else:
+            if (words[i - 3] == "never" and words[i - 2] in ("so", "this")) or words[i - 1] in ("so", "this"):
+                valence = valence * 1.25
+            elif self.is_negation(lowered[i - 3]):
+                valence = valence * self.n_scalar
+        return valence
+
+    def idioms_check(self, valence, words, i):
+        idioms = self.idioms
+        twoone = f"{words[i - 2]} {words[i - 1]}"
+        threetwo = f"{words[i - 3]} {words[i - 2]}"
+        for seq in (f"{words[i - 1]} {words[i]}", f"{twoone} {words[i]}", twoone,
+                    f"{threetwo} {words[i - 1]}", threetwo):
+            if seq in idioms:
+                valence = idioms[seq]
+                break
+        if len(words) - 1 > i:
+            zeroone = f"{words[i]} {words[i + 1]}"
+            if zeroone in idioms:
+                valence = idioms[zeroone]
+        if len(words) - 1 > i + 1:
+            zeroonetwo = f"{words[i]} {words[i + 1]} {words[i + 2]}"
+            if zeroonetwo in idioms:
+                valence = idioms[zeroonetwo]
+        if threetwo in self.boosters or twoone in self.boosters:
+            valence = valence + self.b_decr
+        return valence
+
+    def score(self, texts):
+        """Compound scores for a list of strings, in order."""
+        compound = self.compound
+        return [compound(text) for text in texts]
+
+
+def check_parity(scorer, analyzer, texts, tolerance=PARITY_TOLERANCE):
+    """Texts whose batch score differs from ``analyzer.polarity_scores`` by more than ``tolerance``.
+
+    Returns ``(max_difference, [(text, expected, actual), ...])``.
+    """
+    worst = 0.0
+    mismatches = []
+    for text, actual in zip(texts, scorer.score(texts)):
+        expected = analyzer.polarity_scores(text)['compound']
+        difference = abs(expected - actual)
+        worst = max(worst, difference)
+        if difference > tolerance:
+            mismatches.append((text, expected, actual))
+    return worst, mismatches
+
+
+def throughput(score, texts):
+    """Texts per second for ``score(texts)``."""
+    start = time.perf_counter()
+    score(texts)
+    return len(texts) / max(time.perf_counter() - start, 1e-9)
+
+
+def review_texts(rows=None):
+    """The GUI's per-row texts from the dataset snapshot, one per row as ``aggregate_texts`` builds them:
+    non-missing TEXT_COLUMNS joined by spaces, and an empty string for a row with none."""
+    from dataset_snapshot import load_snapshot
+    df = load_snapshot(DATASET_NAME, columns=TEXT_COLUMNS)
+    if rows is not None:
+        df = df.head(rows)
+    present = df.notna().to_numpy()
+    texts = df.fillna('').astype(str).to_numpy(dtype=object)
+    return [" ".join(row[keep]) for row, keep in zip(texts, present)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the batch VADER scorer against NLTK.")
+    parser.add_argument("--rows", type=int, help="Only use the first ROWS reviews.")
+    parser.add_argument("--tolerance", type=float, default=PARITY_TOLERANCE)
+    parser.add_argument("--min-speedup", type=float, default=TARGET_SPEEDUP,
+                        help="Fail when the batch scorer is not this many times faster.")
+    args = parser.parse_args(argv)
+    from vader_scoring import get_analyzer
+    analyzer = get_analyzer()
+    scorer = BatchVaderScorer(analyzer)
+    texts = review_texts(args.rows)
+
+    worst, mismatches = check_parity(scorer, analyzer, texts, args.tolerance)
+    print(f"{len(texts)} texts, {len(mismatches)} mismatches, largest difference {worst:.3g}")
+    for text, expected, actual in mismatches[:10]:
+        print(f"  {expected:+.4f} != {actual:+.4f}  {text[:80]!r}")
+
+    per_call = throughput(lambda batch: [analyzer.polarity_scores(t)['compound'] for t in batch], texts)
+    # A fresh scorer, so the tokens cleaned during the parity pass do not flatter it.
+    batch = throughput(BatchVaderScorer(analyzer).score, texts)
+    speedup = batch / per_call
+    print(f"polarity_scores: {per_call:,.0f} texts/s, batch: {batch:,.0f} texts/s ({speedup:.1f}x)")
+    return 1 if mismatches or speedup < args.min_speedup else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
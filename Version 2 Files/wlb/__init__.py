@@ -0,0 +1 @@
+"""Headless batch analysis for scheduled runs: ``python -m wlb analyze export.csv --column Likes --out report/``."""
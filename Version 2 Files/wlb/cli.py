@@ -0,0 +1,191 @@
+import argparse
+import os
+import re
+import sys
+import matplotlib
+# No display on batch hosts; must be selected before pyplot is imported anywhere.
+matplotlib.use("Agg")
+from matplotlib import pyplot as plt
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from analysis_function import (analyze_text_column, analyze_numeric_column, rating_scaler,
+                               to_numeric_values, generate_predefined_summary_numeric,
+                               generate_predefined_summary_text, SCALE_FIXED, SCALE_RUNNING, SCALE_FIT)
+from column_types import infer_column_type, NUMERIC, PERCENT
+from diagnostics import Tracer, DISABLED_TRACER
+from parallel_scoring import DEFAULT_CHUNK_SIZE
+from polarity_cache import DEFAULT_CACHE_PATH
+from sentiment_backends import BACKEND_TEXTBLOB, backend_choices, get_backend, open_score_cache
+from streaming_analysis import analyze_csv_streaming, DEFAULT_STREAM_CHUNK_ROWS
+from data_visuals import (generate_pie_chart, generate_sentiment_pie_chart, generate_scatter_plot,
+                          generate_sentiment_scatter_plot, generate_bar_chart_text, generate_bar_chart_numeric,
+                          generate_wordcloud_from_frequencies, generate_distribution_chart)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m wlb", description="Work-life balance sentiment analysis without a GUI.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    analyze = commands.add_parser("analyze", help="Analyze one column of a CSV and write charts, a summary and scores.")
+    analyze.add_argument("csv", help="CSV file to analyze.")
+    analyze.add_argument("--column", required=True, help="Column to analyze (text reviews or numeric ratings).")
+    analyze.add_argument("--out", required=True, help="Directory for the report; created if missing.")
+    analyze.add_argument("--workers", type=int, default=1, help="Scoring processes (0 = one per CPU). Default: 1.")
+    analyze.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                         help=f"Texts per scoring chunk. Default: {DEFAULT_CHUNK_SIZE}.")
+    analyze.add_argument("--cache", default=DEFAULT_CACHE_PATH, help=f"Polarity cache file. Default: {DEFAULT_CACHE_PATH}.")
+    analyze.add_argument("--no-cache", action="store_true", help="Do not read or write the polarity cache.")
+    analyze.add_argument("--stream", action="store_true",
+                         help="Read the CSV in chunks and keep only aggregates (no per-row scores file).")
+    analyze.add_argument("--stream-rows", type=int, default=DEFAULT_STREAM_CHUNK_ROWS,
+                         help=f"Rows per chunk with --stream. Default: {DEFAULT_STREAM_CHUNK_ROWS}.")
+    analyze.add_argument("--scale", choices=[SCALE_FIXED, SCALE_RUNNING, SCALE_FIT],
+                         help="Rating scaling; default is fixed for columns with a declared range, else fit.")
+    analyze.add_argument("--backend", choices=list(backend_choices()), default=BACKEND_TEXTBLOB,
+                         help="Text scorer (see the backends command). Default: textblob.")
+    analyze.add_argument("--trace", metavar="PATH",
+                         help="Write per-phase timings to PATH as a Chrome trace (chrome://tracing, ui.perfetto.dev).")
+    commands.add_parser("backends", help="List the text scorers and their rough cost.")
+    return parser
+
+
+def save_figure(fig, path):
+    fig.savefig(path, dpi=100, bbox_inches="tight")
+    plt.close(fig)
+    return path
+
+
+def write_report(out_dir, charts, summary, tracer=DISABLED_TRACER):
+    """Render each ``(file name, build_figure)`` chart and the summary into ``out_dir``."""
+    written = []
+    for name, build_figure in charts:
+        with tracer.span(f"generate_figure: {name}"):
+            written.append(save_figure(build_figure(), os.path.join(out_dir, name)))
+    summary_path = os.path.join(out_dir, "summary.txt")
+    with open(summary_path, "w", encoding="utf-8") as f:
+        f.write(summary + "\n")
+    written.append(summary_path)
+    return written
+
+
+def write_scores(path, data, result):
+    """Write ``data`` plus the result's per-row columns to Parquet without adding them to ``data``.
+
+    Labels are stored dictionary-encoded and scores as float32; a derived column replaces a
+    loaded column of the same name, as assigning it into the frame used to.
+    """
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    for name, values in result.columns().items():
+        values = pa.array(values, from_pandas=True)
+        if name in table.column_names:
+            table = table.set_column(table.column_names.index(name), name, values)
+        else:
+            table = table.append_column(name, values)
+    pq.write_table(table, path)
+    return path
+
+
+def text_charts(result, scatter):
+    return [("pie_chart.png", lambda: generate_pie_chart(result)),
+            ("scatter_plot.png", lambda: scatter(result)),
+            ("bar_chart.png", lambda: generate_bar_chart_text(result)),
+            ("wordcloud_positive.png",
+             lambda: generate_wordcloud_from_frequencies(result.word_index.frequencies(2), "Positive Word Cloud")),
+            ("wordcloud_negative.png",
+             lambda: generate_wordcloud_from_frequencies(result.word_index.frequencies(0), "Negative Word Cloud"))]
+
+
+def numeric_charts(result, scatter):
+    return [("pie_chart.png", lambda: generate_sentiment_pie_chart(result)),
+            ("scatter_plot.png", lambda: scatter(result)),
+            ("bar_chart.png", lambda: generate_bar_chart_numeric(result))]
+
+
+def analyze_file(path, column, out_dir, workers=1, chunk_size=DEFAULT_CHUNK_SIZE, cache=None,
+                 stream=False, stream_rows=DEFAULT_STREAM_CHUNK_ROWS, scale_mode=None, backend=BACKEND_TEXTBLOB,
+                 tracer=DISABLED_TRACER):
+    """Analyze ``column`` of a CSV and write the report; returns the paths written."""
+    if column not in pd.read_csv(path, nrows=0).columns:
+        raise ValueError(f"Column {column!r} not found in {path}.")
+    os.makedirs(out_dir, exist_ok=True)
+    scaler = rating_scaler(column, scale_mode)
+
+    if stream:
+        result = analyze_csv_streaming(path, column, stream_rows, workers, chunk_size, cache, scaler=scaler,
+                                       backend=backend, tracer=tracer).result()
+        if result.kind == 'numeric':
+            return write_report(out_dir, numeric_charts(result, generate_distribution_chart),
+                                generate_predefined_summary_numeric(result), tracer)
+        return write_report(out_dir, text_charts(result, generate_distribution_chart),
+                            generate_predefined_summary_text(result), tracer)
+
+    with tracer.span("load_data", path=path):
+        data = pd.read_csv(path)
+    tracer.count("rows_loaded", len(data))
+    with tracer.span("infer_column_type", column=column):
+        column_type = infer_column_type(data[column])
+    if column_type in (NUMERIC, PERCENT):
+        with tracer.span("analyze", column=column):
+            result = analyze_numeric_column(to_numeric_values(data[column], column_type == PERCENT), scaler)
+        written = write_report(out_dir, numeric_charts(result, generate_sentiment_scatter_plot),
+                               generate_predefined_summary_numeric(result), tracer)
+    else:
+        with tracer.span("analyze", column=column, backend=backend):
+            result = analyze_text_column(data[column], workers, chunk_size, cache, backend=backend, tracer=tracer)
+        written = write_report(out_dir, text_charts(result, generate_scatter_plot),
+                               generate_predefined_summary_text(result), tracer)
+    scores_path = os.path.join(out_dir, "scored.parquet")
+    with tracer.span("write_scores"):
+        written.append(write_scores(scores_path, data, result))
+    return written
+
+
+def list_backends(out=sys.stdout):
+    print(f"{'name':<12} {'load':>6} {'texts/s':>9}  pool  cache  scorer", file=out)
+    for name in backend_choices():
+        backend = get_backend(name)
+        cost = backend.cost
+        print(f"{name:<12} {cost.load_seconds:>5.1f}s {cost.texts_per_second:>9,}  "
+              f"{'yes' if cost.parallel else 'no':<4}  {'yes' if backend.cacheable else 'no':<5}  {backend.label}",
+              file=out)
+    return 0
+
+
+def missing_resource_error(error):
+    """A one-line message for NLTK's multi-line LookupError, with the command that fetches the resource."""
+    text = re.sub(r"\x1b\[[0-9;]*m", "", str(error))
+    found = re.search(r"Resource (\S+) not found", text)
+    if found is None:
+        return text.strip().splitlines()[0] if text.strip() else "A required NLTK resource is missing."
+    return f"NLTK resource {found.group(1)} not found; download it with: python -m nltk.downloader {found.group(1)}"
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "backends":
+        return list_backends()
+    cache = None
+    tracer = Tracer(enabled=True) if args.trace else DISABLED_TRACER
+    try:
+        # Opened in here: the classifier's cache key needs its model file, which may be missing.
+        cache = None if args.no_cache else open_score_cache(args.backend, args.cache)
+        written = analyze_file(args.csv, args.column, args.out, args.workers, args.chunk_size, cache,
+                               args.stream, args.stream_rows, args.scale, args.backend, tracer)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    except LookupError as e:
+        # Raised by NLTK when a backend's data (e.g. vader_lexicon for --backend vader) is not installed.
+        print(f"error: {missing_resource_error(e)}", file=sys.stderr)
+        return 1
+    finally:
+        if cache is not None:
+            tracer.count("cache_hits", cache.hits)
+            tracer.count("cache_misses", cache.misses)
+            cache.close()
+    for path in written:
+        print(path)
+    if args.trace:
+        print(tracer.export(args.trace))
+        print(tracer.report(), file=sys.stderr)
+    return 0
@@ -0,0 +1,88 @@
+import hashlib
+import heapq
+import json
+import os
+import numpy as np
+from PIL import Image
+
+DEFAULT_RENDER_DIR = os.path.join(os.path.expanduser("~"), ".wlb_cache", "wordclouds")
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+# WordCloud only ever places its ``max_words`` most frequent words (200 by default), so the rest
+# of the table can change without changing the picture.
+TOP_WORDS = 200
+
+
+def top_frequencies(frequencies, top_n=TOP_WORDS):
+    """The ``top_n`` most frequent words, ties broken by word so the result is deterministic."""
+    return heapq.nsmallest(top_n, frequencies.items(), key=lambda item: (-item[1], item[0]))
+
+
+class WordCloudCache:
+    """PNG renders of word clouds on disk, keyed by the top-N frequency table and render options.
+
+    Reopening an analysis, switching back to a column or restarting the app shows a cloud that
+    was already laid out without running WordCloud again. The directory is capped at
+    ``max_bytes``; the least recently used images are deleted first.
+    """
+
+    def __init__(self, directory=DEFAULT_RENDER_DIR, max_bytes=DEFAULT_MAX_BYTES, top_n=TOP_WORDS):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.top_n = top_n
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, top, width, height, background_color, title):
+        raw = json.dumps([width, height, background_color, title, self.top_n, top], ensure_ascii=False)
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+    def render(self, frequencies, width=800, height=400, background_color='white', title=''):
+        """Return the word cloud for ``frequencies`` as an RGB image array, from disk when possible."""
+        top = top_frequencies(frequencies, self.top_n)
+        path = os.path.join(self.directory, self.key(top, width, height, background_color, title) + ".png")
+        if os.path.exists(path):
+            try:
+                with Image.open(path) as image:
+                    pixels = np.asarray(image.convert("RGB"))
+                # The modification time doubles as the last-used time for eviction.
+                os.utime(path)
+                return pixels
+            except OSError:
+                pass
+        # Imported on first render so wordcloud stays off the startup path.
+        from wordcloud import WordCloud
+        wordcloud = WordCloud(width=width, height=height, background_color=background_color,
+                              max_words=self.top_n).generate_from_frequencies(dict(top))
+        pixels = wordcloud.to_array()
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        Image.fromarray(pixels).save(tmp_path, format="PNG")
+        os.replace(tmp_path, path)
+        self.evict()
+        return pixels
+
+    def evict(self):
+        """Delete the least recently used renders until the directory fits in ``max_bytes``."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".png"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+
+_cache = None
+
+
+def get_wordcloud_cache():
+    """Return the process-wide render cache, creating its directory on first use."""
+    global _cache
+    if _cache is None:
+        _cache = WordCloudCache()
+    return _cache
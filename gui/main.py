@@ -1,54 +1,89 @@
+import os
+import queue
+import threading
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from datasets import load_dataset
-import nltk
-from nltk.sentiment import SentimentIntensityAnalyzer
-from wordcloud import WordCloud
+from wordcloud_cache import get_wordcloud_cache
 import customtkinter as ctk
-
-nltk.download('vader_lexicon')
-
-ds = load_dataset("kmrmanish/Employees_Reviews_Dataset")
-df = ds['train'].to_pandas()
+from vader_scoring import vader_lexicon_available
+from sentiment_backends import score_texts, open_score_cache, get_backend, BACKEND_VADER
+from word_index import WordFrequencyIndex
+from dataset_snapshot import load_snapshot
+
+# Set SCORING_WORKERS above 1 (or to 0 for one per CPU) to score large datasets on a process pool.
+SCORING_WORKERS = 1
+SCORING_CHUNK_SIZE = 5000
+# Scores are kept on disk between runs; set to False to always rescore.
+USE_SCORE_CACHE = True
+# Text scorer for this run: vader, textblob or classifier (see sentiment_backends).
+SENTIMENT_BACKEND = os.environ.get("WLB_BACKEND", BACKEND_VADER)
+TEXT_COLUMNS = ["work_life_balance", "work_satisfaction", "Likes", "Dislikes"]
+WORDCLOUD_COLUMNS = ["Likes", "Dislikes"]
+DATASET_NAME = "kmrmanish/Employees_Reviews_Dataset"
+TABS = ["Sentiment Analysis", "Likes Word Cloud", "Dislikes Word Cloud"]
 
 class SentimentAnalysis:
-    def __init__(self, df):
+    def __init__(self, df, workers=SCORING_WORKERS, chunk_size=SCORING_CHUNK_SIZE, cache=None,
+                 backend=SENTIMENT_BACKEND):
         self.df = df
-        self.sia = SentimentIntensityAnalyzer()
-
-    def aggregate_text(self, row):
-        texts = []
-        for col in ["work_life_balance", "work_satisfaction", "Likes", "Dislikes"]:
-            if col in row and pd.notnull(row[col]):
-                texts.append(str(row[col]))
-        return " ".join(texts)
+        self.backend = backend
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.cache = cache
+        self.word_index = None
+        self.scores = None
+
+    def aggregate_texts(self):
+        """Join each row's non-missing TEXT_COLUMNS with spaces, one vectorized pass per column."""
+        combined = np.full(len(self.df), "", dtype=object)
+        started = np.zeros(len(self.df), dtype=bool)
+        for col in TEXT_COLUMNS:
+            if col not in self.df:
+                continue
+            values = self.df[col]
+            present = values.notna().to_numpy()
+            text = values.astype(str).to_numpy(dtype=object)
+            separator = np.where(started, " ", "").astype(object)
+            combined = np.where(present, combined + separator + text, combined)
+            started |= present
+        return combined
+
+    def score(self):
+        """Per-row scores from ``self.backend``, computed once and kept in ``self.scores``."""
+        if self.scores is None:
+            scores = score_texts(self.backend, self.aggregate_texts(), self.workers, self.chunk_size, self.cache)
+            self.scores = pd.Series(scores, index=self.df.index, name="score")
+        return self.scores
 
     def analyze(self):
-        sentiments = {"positive": 0, "negative": 0, "neutral": 0}
-        for _, row in self.df.iterrows():
-            agg_text = self.aggregate_text(row)
-            score = self.sia.polarity_scores(agg_text)['compound']
-            if score >= 0.05:
-                sentiments["positive"] += 1
-            elif score <= -0.05:
-                sentiments["negative"] += 1
-            else:
-                sentiments["neutral"] += 1
-
-        total = sum(sentiments.values())
-        percentages = {k: (v / total * 100) if total > 0 else 0 for k, v in sentiments.items()}
+        scores = self.score().to_numpy()
+        self.build_word_index()
+        # Codes index Negative, Neutral, Positive under the backend's own thresholds.
+        counts = np.bincount(get_backend(self.backend).codes(scores), minlength=3)
+        total = len(scores)
+        percentages = {k: (counts[i] / total * 100) if total > 0 else 0
+                       for i, k in [(2, "positive"), (0, "negative"), (1, "neutral")]}
         return percentages
 
-    def generate_wordcloud(self, column):
-        text = " ".join(str(t) for t in self.df[column] if pd.notnull(t))
-        wc = WordCloud(width=800, height=400, background_color='white').generate(text)
-        return wc
+    def build_word_index(self):
+        """Count tokens for every word-cloud column in one pass, each distinct text tokenized once."""
+        self.word_index = WordFrequencyIndex(n_classes=len(WORDCLOUD_COLUMNS))
+        for code, column in enumerate(WORDCLOUD_COLUMNS):
+            if column not in self.df:
+                continue
+            counts = self.df[column].dropna().astype(str).value_counts(sort=False)
+            self.word_index.update(counts.index, [code] * len(counts), counts.to_numpy())
+        return self.word_index
 
-sentiment_analyzer = SentimentAnalysis(df)
+    def generate_wordcloud(self, column):
+        if self.word_index is None:
+            self.build_word_index()
+        frequencies = self.word_index.frequencies(WORDCLOUD_COLUMNS.index(column)) or {"No data available.": 1}
+        return get_wordcloud_cache().render(frequencies, 800, 400, 'white', f"{column} Word Cloud")
 
-def create_sentiment_figure():
-    percentages = sentiment_analyzer.analyze()
+def create_sentiment_figure(percentages):
     labels = list(percentages.keys())
     sizes = list(percentages.values())
     
@@ -74,47 +109,79 @@ def create_dislikes_wc_figure():
     ax.set_title("Dislikes Word Cloud", fontsize=16)
     return fig
 
-ctk.set_appearance_mode("Dark")
-ctk.set_default_color_theme("green")
-
-app = ctk.CTk()
-app.geometry("1200x800")
-app.title("Employee Sentiment Analysis")
-
-message_label = ctk.CTkLabel(
-    app, 
-    text="Thank you for using our services! Here are your results", 
-    font=("Helvetica", 20)
-)
-message_label.pack(pady=(20, 10))
-
-header_label = ctk.CTkLabel(
-    app, 
-    text="Employee Sentiment Analysis", 
-    font=("Helvetica", 28, "bold")
-)
-header_label.pack(pady=(10, 10))
-
-tabview = ctk.CTkTabview(app, width=1100, height=700)
-tabview.pack(padx=20, pady=20)
-
-tabview.add("Sentiment Analysis")
-tabview.add("Likes Word Cloud")
-tabview.add("Dislikes Word Cloud")
-
-sentiment_fig = create_sentiment_figure()
-sentiment_canvas = FigureCanvasTkAgg(sentiment_fig, master=tabview.tab("Sentiment Analysis"))
-sentiment_canvas.draw()
-sentiment_canvas.get_tk_widget().pack(fill='both', expand=True, padx=10, pady=10)
-
-likes_fig = create_likes_wc_figure()
-likes_canvas = FigureCanvasTkAgg(likes_fig, master=tabview.tab("Likes Word Cloud"))
-likes_canvas.draw()
-likes_canvas.get_tk_widget().pack(fill='both', expand=True, padx=10, pady=10)
-
-dislikes_fig = create_dislikes_wc_figure()
-dislikes_canvas = FigureCanvasTkAgg(dislikes_fig, master=tabview.tab("Dislikes Word Cloud"))
-dislikes_canvas.draw()
-dislikes_canvas.get_tk_widget().pack(fill='both', expand=True, padx=10, pady=10)
-
-app.mainloop()
+def load_results():
+    """Load and score the dataset; runs on a background thread, so it must not touch Tk or pyplot."""
+    if SENTIMENT_BACKEND == BACKEND_VADER and not vader_lexicon_available():
+        raise LookupError("The NLTK VADER lexicon is not installed. Run: python -m nltk.downloader vader_lexicon")
+    df = load_snapshot(DATASET_NAME, columns=TEXT_COLUMNS)
+    analyzer = SentimentAnalysis(df, cache=open_score_cache(SENTIMENT_BACKEND) if USE_SCORE_CACHE else None)
+    return analyzer, analyzer.analyze()
+
+def draw_figure(fig, tab_name):
+    canvas = FigureCanvasTkAgg(fig, master=tabview.tab(tab_name))
+    canvas.draw()
+    canvas.get_tk_widget().pack(fill='both', expand=True, padx=10, pady=10)
+
+def load_in_background():
+    try:
+        results.put(('done', load_results()))
+    except Exception as e:
+        results.put(('error', e))
+
+def show_results():
+    """Poll for the background load and draw the figures on the Tk thread once it is done."""
+    global sentiment_analyzer
+    try:
+        kind, payload = results.get_nowait()
+    except queue.Empty:
+        app.after(100, show_results)
+        return
+    for label in loading_labels:
+        label.destroy()
+    if kind == 'error':
+        for tab_name in TABS:
+            ctk.CTkLabel(tabview.tab(tab_name), text=f"Could not load results: {payload}", wraplength=900).pack(expand=True)
+        return
+    sentiment_analyzer, percentages = payload
+    draw_figure(create_sentiment_figure(percentages), "Sentiment Analysis")
+    draw_figure(create_likes_wc_figure(), "Likes Word Cloud")
+    draw_figure(create_dislikes_wc_figure(), "Dislikes Word Cloud")
+
+if __name__ == "__main__":
+    ctk.set_appearance_mode("Dark")
+    ctk.set_default_color_theme("green")
+
+    app = ctk.CTk()
+    app.geometry("1200x800")
+    app.title("Employee Sentiment Analysis")
+
+    message_label = ctk.CTkLabel(
+        app, 
+        text="Thank you for using our services! Here are your results", 
+        font=("Helvetica", 20)
+    )
+    message_label.pack(pady=(20, 10))
+
+    header_label = ctk.CTkLabel(
+        app, 
+        text="Employee Sentiment Analysis", 
+        font=("Helvetica", 28, "bold")
+    )
+    header_label.pack(pady=(10, 10))
+
+    tabview = ctk.CTkTabview(app, width=1100, height=700)
+    tabview.pack(padx=20, pady=20)
+
+    for tab_name in TABS:
+        tabview.add(tab_name)
+
+    # The window is shown straight away; the dataset is loaded and scored off the Tk thread.
+    loading_labels = [ctk.CTkLabel(tabview.tab(tab_name), text="Loading dataset...", font=("Helvetica", 18))
+                      for tab_name in TABS]
+    for label in loading_labels:
+        label.pack(expand=True)
+    results = queue.Queue()
+    threading.Thread(target=load_in_background, daemon=True).start()
+    app.after(100, show_results)
+
+    app.mainloop()
@@ -0,0 +1,58 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+
+DEFAULT_CHUNK_SIZE = 5000
+# Below this many rows the pool start-up (and the lexicon load in every worker) costs more
+# than it saves, so scoring stays in-process.
+MIN_PARALLEL_ROWS = 20000
+
+
+def resolve_workers(workers):
+    """Turn a worker setting into a process count (0 or None means one per CPU)."""
+    if not workers:
+        return os.cpu_count() or 1
+    return max(1, int(workers))
+
+
+def score_in_parallel(texts, score_chunk, workers=1, chunk_size=DEFAULT_CHUNK_SIZE, min_rows=MIN_PARALLEL_ROWS,
+                      progress=None):
+    """Score ``texts`` with ``score_chunk`` across a process pool and return a float array in input order.
+
+    ``score_chunk`` must be a module-level function taking a list of strings and returning one
+    score per string, so it can be sent to the worker processes. ``progress``, if given, is
+    called with the number of texts scored so far after every chunk; an exception raised from
+    it stops the scoring and cancels the chunks that have not started yet.
+    """
+    texts = list(texts)
+    workers = resolve_workers(workers)
+    if workers == 1 or len(texts) < min_rows:
+        if progress is None:
+            return np.asarray(score_chunk(texts), dtype=float)
+        scores = np.empty(len(texts), dtype=float)
+        for start in range(0, len(texts), chunk_size):
+            chunk_scores = score_chunk(texts[start:start + chunk_size])
+            scores[start:start + len(chunk_scores)] = chunk_scores
+            progress(start + len(chunk_scores))
+        return scores
+
+    scores = np.empty(len(texts), dtype=float)
+    done = 0
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = {}
+        for start in range(0, len(texts), chunk_size):
+            chunk = texts[start:start + chunk_size]
+            futures[pool.submit(score_chunk, chunk)] = start
+        for future in as_completed(futures):
+            start = futures[future]
+            chunk_scores = future.result()
+            scores[start:start + len(chunk_scores)] = chunk_scores
+            done += len(chunk_scores)
+            if progress is not None:
+                progress(done)
+    except BaseException:
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+    return scores
@@ -0,0 +1,143 @@
+import datetime
+import json
+import os
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Bump whenever the saved arrays or the tokenizer change; older artifacts are then refused.
+MODEL_FORMAT = 1
+DEFAULT_MODEL_PATH = os.environ.get(
+    "WLB_MODEL_PATH", os.path.join(os.path.expanduser("~"), ".wlb_cache", "models", f"review_nb-v{MODEL_FORMAT}.npz"))
+# Anything that is not a letter, digit or apostrophe separates tokens.
+TOKEN_SPLIT = r"[^\p{L}\p{N}']+"
+
+
+def tokenize(texts):
+    """Lowercase word tokens of a string array, with the row each token came from.
+
+    Runs entirely in Arrow compute kernels. Returns ``(tokens, rows)`` where ``tokens`` is a
+    pyarrow string array and ``rows`` a NumPy array of row positions.
+    """
+    if isinstance(texts, pa.ChunkedArray):
+        texts = texts.combine_chunks()
+    elif not isinstance(texts, pa.Array):
+        texts = pa.array(texts, type=pa.string())
+    lists = pc.split_pattern_regex(pc.utf8_lower(texts), TOKEN_SPLIT)
+    tokens = pc.list_flatten(lists)
+    rows = pc.list_parent_indices(lists)
+    keep = pc.not_equal(tokens, "")
+    return tokens.filter(keep), rows.filter(keep).to_numpy()
+
+
+class ReviewClassifier:
+    """Multinomial Naive Bayes over a bag of words, trained and applied one batch at a time."""
+
+    def __init__(self, classes, vocabulary, class_log_prior, feature_log_prob, metadata=None):
+        self.classes = np.asarray(classes)
+        self.vocabulary = vocabulary if isinstance(vocabulary, pa.Array) else pa.array(vocabulary, type=pa.string())
+        self.class_log_prior = np.asarray(class_log_prior)
+        self.feature_log_prob = np.asarray(feature_log_prob)
+        self.metadata = metadata or {}
+
+    @classmethod
+    def train(cls, texts, labels, alpha=1.0, min_count=2):
+        """Fit on ``texts`` and their ``labels``; words seen fewer than ``min_count`` times are dropped."""
+        classes, y = np.unique(np.asarray(labels), return_inverse=True)
+        tokens, rows = tokenize(texts)
+        encoded = pc.dictionary_encode(tokens)
+        ids = encoded.indices.to_numpy()
+        n_words = len(encoded.dictionary)
+        counts = np.bincount(y[rows] * n_words + ids, minlength=len(classes) * n_words)
+        counts = counts.reshape(len(classes), n_words)
+        keep = counts.sum(axis=0) >= min_count
+        counts = counts[:, keep]
+        vocabulary = encoded.dictionary.filter(pa.array(keep))
+        smoothed = counts + alpha
+        feature_log_prob = np.log(smoothed) - np.log(smoothed.sum(axis=1, keepdims=True))
+        class_log_prior = np.log(np.bincount(y, minlength=len(classes)) / len(y))
+        metadata = {"documents": int(len(y)), "alpha": alpha, "min_count": min_count,
+                    "trained_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")}
+        return cls(classes, vocabulary, class_log_prior, feature_log_prob, metadata)
+
+    def joint_log_likelihood(self, texts):
+        """Per-class log P(class) + log P(words | class) as an ``(n_texts, n_classes)`` array."""
+        n = len(texts)
+        tokens, rows = tokenize(texts)
+        ids = pc.index_in(tokens, value_set=self.vocabulary)
+        known = ids.is_valid().to_numpy(zero_copy_only=False)
+        rows = rows[known]
+        ids = ids.filter(ids.is_valid()).to_numpy()
+        scores = np.tile(self.class_log_prior, (n, 1))
+        for k in range(len(self.classes)):
+            scores[:, k] += np.bincount(rows, weights=self.feature_log_prob[k, ids], minlength=n)
+        return scores
+
+    def predict_proba(self, texts):
+        scores = self.joint_log_likelihood(texts)
+        scores = np.exp(scores - scores.max(axis=1, keepdims=True))
+        return scores / scores.sum(axis=1, keepdims=True)
+
+    def predict(self, texts):
+        """Most likely class for each text, as a NumPy array of labels."""
+        return self.classes[self.joint_log_likelihood(texts).argmax(axis=1)]
+
+    def classify(self, text):
+        return self.predict([text])[0]
+
+    def polarity(self, texts):
+        """P('pos') - P('neg') for each text, a score in [-1, 1] on the same scale as TextBlob polarity."""
+        return self.predict_batch(texts)[1]
+
+    def predict_batch(self, texts):
+        """Labels and polarity for a whole batch in one vectorized pass: ``(labels, polarity)``."""
+        proba = self.predict_proba(texts)
+        classes = list(self.classes)
+        polarity = proba[:, classes.index('pos')] - proba[:, classes.index('neg')]
+        return self.classes[proba.argmax(axis=1)], polarity
+
+    def save(self, path=DEFAULT_MODEL_PATH):
+        """Write the model to a compressed ``.npz`` file tagged with MODEL_FORMAT."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as handle:
+            np.savez_compressed(
+                handle, format_version=MODEL_FORMAT, classes=self.classes.astype(str),
+                vocabulary=np.asarray(self.vocabulary.to_pylist(), dtype=str),
+                class_log_prior=self.class_log_prior, feature_log_prob=self.feature_log_prob,
+                metadata=json.dumps(self.metadata))
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path=DEFAULT_MODEL_PATH):
+        """Read a model written by ``save``; raises ValueError for an artifact of another format."""
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data["format_version"])
+            if version != MODEL_FORMAT:
+                raise ValueError(f"{path} holds model format {version}, expected {MODEL_FORMAT}; "
+                                 f"retrain it with train_reviews.py")
+            return cls(data["classes"], data["vocabulary"].tolist(), data["class_log_prior"],
+                       data["feature_log_prob"], json.loads(str(data["metadata"])))
+
+
+_classifiers = {}
+
+
+def get_classifier(path=DEFAULT_MODEL_PATH):
+    """Return the model saved at ``path``, loading it only on the first call in this process."""
+    if path not in _classifiers:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No trained review classifier at {path}; run train_reviews.py first.")
+        _classifiers[path] = ReviewClassifier.load(path)
+    return _classifiers[path]
+
+
+def predict_batch(texts, path=DEFAULT_MODEL_PATH):
+    """``(labels, polarity)`` for ``texts`` from the process-wide model at ``path``."""
+    return get_classifier(path).predict_batch(texts)
+
+
+def classifier_polarity(texts):
+    """Classifier polarity for a list of strings; module-level so process pool workers can run it."""
+    return get_classifier().polarity(texts)
@@ -1,16 +1,48 @@
-from datasets import load_dataset
-from textblob.classifiers import NaiveBayesClassifier
-
-dataset = load_dataset('kmrmanish/Employees_Reviews_Dataset', split='train')
-data_dict = dataset.to_dict()
-i = 0
-while i < len(data_dict['work_life_balance']):
-    if data_dict['work_life_balance'][i] is None:
-        for column in data_dict:
-            data_dict[column].pop(i)
-    else:
-        i += 1
-text = list(map(' '.join, zip(list(map(str, data_dict['Likes'])), list(map(str, data_dict['Dislikes'])))))
-train = list(zip(text, list(map(lambda score: 'pos' if score > 3 else 'neg', data_dict['work_life_balance']))))
-cl = NaiveBayesClassifier(train)
-print(cl.classify("I love working here"))
\ No newline at end of file
+"""Train the work-life-balance review classifier and save it for later runs.
+
+    python train_reviews.py [--out PATH] [--holdout 0.2]
+
+Reviews rated above 3 for work-life balance are labelled 'pos', the rest 'neg'; rows without
+a rating are skipped.
+"""
+import argparse
+import numpy as np
+import pyarrow.compute as pc
+from dataset_snapshot import load_snapshot
+from review_classifier import ReviewClassifier, DEFAULT_MODEL_PATH
+
+DATASET_NAME = 'kmrmanish/Employees_Reviews_Dataset'
+
+
+def load_training_data(dataset_name=DATASET_NAME):
+    """Review texts (Likes and Dislikes joined) and 'pos'/'neg' labels as pyarrow and NumPy arrays."""
+    table = load_snapshot(dataset_name, columns=['Likes', 'Dislikes', 'work_life_balance'], as_arrow=True)
+    table = table.filter(pc.is_valid(table['work_life_balance']))
+    text = pc.binary_join_element_wise(pc.fill_null(table['Likes'], ''), pc.fill_null(table['Dislikes'], ''), ' ')
+    labels = np.where(pc.greater(table['work_life_balance'], 3).to_numpy(zero_copy_only=False), 'pos', 'neg')
+    return text, labels
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--out', default=DEFAULT_MODEL_PATH, help='Where to write the model artifact.')
+    parser.add_argument('--holdout', type=float, default=0.2,
+                        help='Share of reviews held back to report accuracy (0 trains on everything).')
+    parser.add_argument('--min-count', type=int, default=2, help='Drop words seen fewer times than this.')
+    args = parser.parse_args(argv)
+
+    text, labels = load_training_data()
+    order = np.random.default_rng(0).permutation(len(labels))
+    n_test = int(len(labels) * args.holdout)
+    test, train = order[:n_test], order[n_test:]
+    cl = ReviewClassifier.train(text.take(train), labels[train], min_count=args.min_count)
+    if n_test:
+        accuracy = (cl.predict(text.take(test)) == labels[test]).mean()
+        print(f"holdout accuracy: {accuracy:.3f} on {n_test} reviews")
+        cl.metadata['holdout_accuracy'] = float(accuracy)
+    print(f"saved {cl.save(args.out)}")
+    print(cl.classify("I love working here"))
+
+
+if __name__ == '__main__':
+    main()